@@ -7,7 +7,9 @@ on first run.
 Lifecycle::
 
     db_id = bet_db.record_bet(...)     # called after placing a bet
+                                       # (with the Betfair bet id, if real)
     bet_db.settle_bet(db_id, ...)      # called when the bet is settled
+    bet_db.settle_bets_bulk([...])     # or settle a batch in one transaction
 
 Statistics queries (examples)::
 
@@ -21,7 +23,7 @@ Statistics queries (examples)::
     GROUP BY competition ORDER BY total_pnl DESC;
 
     -- Monthly performance
-    SELECT strftime('%Y-%m', bet_time) AS month,
+    SELECT strftime('%Y-%m', bet_time, 'unixepoch') AS month,
            COUNT(*) AS bets,
            ROUND(SUM(profit_loss), 2) AS pnl
     FROM bets WHERE result IS NOT NULL
@@ -33,15 +35,18 @@ from __future__ import annotations
 import logging
 import sqlite3
 import threading
+import time
 from contextlib import contextmanager
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Generator, Optional
+from typing import Generator, Iterable, List, NamedTuple, Optional, Set, Tuple
 
 logger = logging.getLogger("bet_sniper.bet_db")
 
-_CREATE_TABLE = """
-CREATE TABLE IF NOT EXISTS bets (
+_SECONDS_PER_DAY = 86400
+
+# ``bet_time`` / ``settled_time`` are UTC epoch seconds.
+_BETS_SCHEMA = """(
     id               INTEGER PRIMARY KEY AUTOINCREMENT,
     event_id         TEXT    NOT NULL,
     event_name       TEXT    NOT NULL,
@@ -51,51 +56,374 @@ CREATE TABLE IF NOT EXISTS bets (
     selection_name   TEXT    NOT NULL,
     odds             REAL    NOT NULL,
     stake            REAL    NOT NULL,
-    bet_time         TEXT    NOT NULL,
+    bet_time         INTEGER NOT NULL,
     paper_trade      INTEGER NOT NULL DEFAULT 0,
     result           TEXT,
     profit_loss      REAL,
-    settled_time     TEXT,
+    settled_time     INTEGER,
+    betfair_bet_id   TEXT,
     created_at       TEXT    NOT NULL DEFAULT (datetime('now')),
     updated_at       TEXT    NOT NULL DEFAULT (datetime('now'))
+)"""
+
+_CREATE_TABLE = "CREATE TABLE IF NOT EXISTS bets " + _BETS_SCHEMA
+
+# One-shot rebuild for databases created when the timestamps were ISO TEXT
+# columns (a TEXT-affinity column would keep turning integers back into text).
+_BETS_COLUMNS = """
+    id, event_id, event_name, competition, market_id, selection_id,
+    selection_name, odds, stake, bet_time, paper_trade, result, profit_loss,
+    settled_time, created_at, updated_at
+"""
+
+# Databases created before bets stored their Betfair bet id.
+_ADD_BETFAIR_BET_ID = "ALTER TABLE bets ADD COLUMN betfair_bet_id TEXT"
+
+_MIGRATE_TO_EPOCH = [
+    "CREATE TABLE bets_epoch " + _BETS_SCHEMA,
+    f"""
+    INSERT INTO bets_epoch ({_BETS_COLUMNS})
+    SELECT id, event_id, event_name, competition, market_id, selection_id,
+           selection_name, odds, stake,
+           CAST(strftime('%s', bet_time) AS INTEGER),
+           paper_trade, result, profit_loss,
+           CAST(strftime('%s', settled_time) AS INTEGER),
+           created_at, updated_at
+    FROM bets
+    """,
+    "DROP TABLE bets",
+    "ALTER TABLE bets_epoch RENAME TO bets",
+]
+
+# Per-competition rollup of settled real bets, maintained incrementally by
+# settle_bets_bulk() so /stats never has to GROUP BY over the whole history.
+_CREATE_COMPETITION_STATS = """
+CREATE TABLE IF NOT EXISTS competition_stats (
+    competition      TEXT    PRIMARY KEY,
+    cnt              INTEGER NOT NULL DEFAULT 0,
+    pnl              REAL    NOT NULL DEFAULT 0
 )
 """
 
+_SQL_BACKFILL_COMPETITION_STATS = """
+INSERT INTO competition_stats (competition, cnt, pnl)
+SELECT COALESCE(competition, ''), COUNT(*), COALESCE(SUM(profit_loss), 0)
+FROM bets
+WHERE result IS NOT NULL AND paper_trade = 0
+GROUP BY COALESCE(competition, '')
+"""
+
 _CREATE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_bets_event_id ON bets(event_id)",
-    "CREATE INDEX IF NOT EXISTS idx_bets_bet_time ON bets(bet_time)",
+    # Superseded by idx_bets_paper_time (covers the daily-spend lookup).
+    "DROP INDEX IF EXISTS idx_bets_bet_time",
+    "CREATE INDEX IF NOT EXISTS idx_bets_paper_time ON bets(paper_trade, bet_time, stake)",
     "CREATE INDEX IF NOT EXISTS idx_bets_result ON bets(result)",
     "CREATE INDEX IF NOT EXISTS idx_bets_competition ON bets(competition)",
+    # Pending bets are found through idx_bets_paper_time's bet_time range
+    # (the planner never chose this partial index, it only slowed writes).
+    "DROP INDEX IF EXISTS idx_bets_pending",
+    # /stats scans the table once and by-competition totals come from
+    # competition_stats, so no query used this partial index.
+    "DROP INDEX IF EXISTS idx_bets_settled_time",
 ]
 
+_PRAGMAS = [
+    "PRAGMA busy_timeout=5000",       # wait up to 5 s on a locked database
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",       # 64 MiB
+    "PRAGMA mmap_size=268435456",     # 256 MiB
+    # Checkpoints run on a background thread (see _checkpoint_loop) so no
+    # record_bet / settle_bet commit ever pays for one.
+    "PRAGMA wal_autocheckpoint=0",
+    "PRAGMA journal_size_limit=67108864",  # 64 MiB
+]
+
+_CHECKPOINT_INTERVAL_SECS = 30
+
+# get_stats() results are reused for this long unless a write invalidates them.
+_STATS_CACHE_TTL_SECS = 60
+
+# ---------------------------------------------------------------------------
+# Statements – kept as module constants so the identical SQL text hits the
+# connection's prepared-statement cache on every call.
+# ---------------------------------------------------------------------------
+
+_SQL_INSERT_BET = """
+INSERT INTO bets (
+    event_id, event_name, competition,
+    market_id, selection_id, selection_name,
+    odds, stake, bet_time, paper_trade, betfair_bet_id
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_KNOWN_EVENT_IDS = "SELECT DISTINCT event_id FROM bets"
+
+_SQL_TODAY_SPEND = """
+SELECT COALESCE(SUM(stake), 0) AS spend
+FROM bets
+WHERE paper_trade = 0
+  AND bet_time >= ?
+  AND bet_time < ?
+"""
+
+_SQL_SETTLE_BET = """
+UPDATE bets SET
+    result       = ?,
+    profit_loss  = ?,
+    settled_time = ?,
+    updated_at   = datetime('now')
+WHERE id = ?
+"""
+
+_SQL_PENDING_BETS = """
+SELECT id, market_id, selection_id, stake, odds, event_name,
+       selection_name, paper_trade, betfair_bet_id
+FROM bets WHERE result IS NULL AND paper_trade = 0 AND bet_time >= ?
+"""
+
+# All headline aggregates in a single pass over ``bets``: each column applies
+# its own predicate via CASE (portable to SQLite builds without FILTER).
+_SQL_STATS = """
+SELECT
+    COALESCE(SUM(CASE WHEN result IS NOT NULL AND paper_trade = 0 THEN 1 END), 0) AS total,
+    COALESCE(SUM(CASE WHEN result = 'WON' AND paper_trade = 0 THEN 1 END), 0) AS wins,
+    COALESCE(ROUND(
+        SUM(CASE WHEN result = 'WON' AND paper_trade = 0 THEN 1.0 ELSE 0 END)
+        / NULLIF(SUM(CASE WHEN result IS NOT NULL AND paper_trade = 0 THEN 1 END), 0) * 100, 1
+    ), 0) AS win_rate,
+    COALESCE(ROUND(SUM(CASE WHEN result IS NOT NULL AND paper_trade = 0 THEN profit_loss END), 2), 0) AS total_pnl,
+    COALESCE(ROUND(AVG(CASE WHEN result IS NOT NULL AND paper_trade = 0 THEN profit_loss END), 2), 0) AS avg_pnl,
+    COALESCE(ROUND(MAX(CASE WHEN result IS NOT NULL AND paper_trade = 0 THEN profit_loss END), 2), 0) AS best_pnl,
+    COALESCE(ROUND(MIN(CASE WHEN result IS NOT NULL AND paper_trade = 0 THEN profit_loss END), 2), 0) AS worst_pnl,
+    COALESCE(SUM(CASE WHEN result IS NULL AND paper_trade = 0 THEN 1 END), 0) AS open_count,
+    COALESCE(SUM(CASE WHEN paper_trade = 1 THEN 1 END), 0) AS paper_count,
+    COALESCE(SUM(CASE WHEN result IS NOT NULL AND paper_trade = 0
+                       AND bet_time >= :yesterday_start AND bet_time < :today_start
+                      THEN 1 END), 0) AS yesterday_bets,
+    COALESCE(ROUND(SUM(CASE WHEN result IS NOT NULL AND paper_trade = 0
+                             AND bet_time >= :yesterday_start AND bet_time < :today_start
+                            THEN profit_loss END), 2), 0) AS yesterday_pnl,
+    COALESCE(SUM(CASE WHEN result IS NOT NULL AND paper_trade = 0
+                       AND bet_time >= :week_start THEN 1 END), 0) AS week_bets,
+    COALESCE(ROUND(SUM(CASE WHEN result IS NOT NULL AND paper_trade = 0
+                             AND bet_time >= :week_start
+                            THEN profit_loss END), 2), 0) AS week_pnl
+FROM bets
+"""
+
+# Must run before _SQL_SETTLE_BET: only still-pending real bets are counted,
+# so settling the same bet twice cannot double its contribution.
+_SQL_ROLLUP_COMPETITION = """
+INSERT INTO competition_stats (competition, cnt, pnl)
+SELECT COALESCE(competition, ''), 1, ?
+FROM bets
+WHERE id = ? AND result IS NULL AND paper_trade = 0
+ON CONFLICT(competition) DO UPDATE SET
+    cnt = cnt + 1,
+    pnl = pnl + excluded.pnl
+"""
+
+_SQL_STATS_BY_COMPETITION = """
+SELECT competition, cnt, ROUND(pnl, 2) AS pnl
+FROM competition_stats
+"""
+
+
+class PendingBet(NamedTuple):
+    """An unsettled real bet, as returned by :meth:`BetDatabase.get_pending_bets`.
+
+    Field order matches ``_SQL_PENDING_BETS``.
+    """
+
+    id: int
+    market_id: str
+    selection_id: int
+    stake: float
+    odds: float
+    event_name: str
+    selection_name: str
+    paper_trade: int
+    betfair_bet_id: Optional[str]   # NULL for bets recorded before it was stored
+
+
+def _utc_midnight(now: datetime) -> datetime:
+    return now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _stats_time_bounds() -> dict:
+    """Return the named time bounds used by ``_SQL_STATS``."""
+    now = datetime.now(timezone.utc)
+    today_start = _utc_midnight(now)
+    return {
+        "yesterday_start": int((today_start - timedelta(days=1)).timestamp()),
+        "today_start": int(today_start.timestamp()),
+        "week_start": int((now - timedelta(days=7)).timestamp()),
+    }
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def _has_column(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    return any(col["name"] == column for col in conn.execute(f"PRAGMA table_info({table})"))
+
+
+def _has_text_timestamps(conn: sqlite3.Connection) -> bool:
+    """Return True if ``bets.bet_time`` still uses the legacy TEXT column."""
+    for col in conn.execute("PRAGMA table_info(bets)"):
+        if col["name"] == "bet_time":
+            return col["type"].upper() == "TEXT"
+    return False
+
 
 class BetDatabase:
-    """Thread-safe SQLite persistence for bet history."""
+    """Thread-safe SQLite persistence for bet history.
+
+    One long-lived writer connection (serialised by ``_write_lock``) plus one
+    read-only connection per thread.  Under WAL, readers see a consistent
+    snapshot without blocking or being blocked by the writer, so read
+    methods take no lock at all.
+    """
 
     def __init__(self, db_path: Path) -> None:
         self._db_path = str(db_path)
-        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # A long-lived connection keeps the page cache and prepared
+        # statements warm across calls.
+        # Autocommit mode: writes open their own transaction via _transaction().
+        self._conn = sqlite3.connect(
+            self._db_path, check_same_thread=False, isolation_level=None,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._read_local = threading.local()
+        self._read_conns: List[sqlite3.Connection] = []
+        # Every event_id present in the table, so already_bet() never hits
+        # SQLite.  Rebuilt from the DB at start-up, extended by record_bet().
+        self._known_event_ids: Set[str] = set()
+        # (UTC day number, real stake placed that day) – see get_today_spend().
+        self._today_spend_cache: Optional[Tuple[int, float]] = None
+        # (get_stats() result, monotonic expiry, _write_gen it was read at).
+        self._stats_cache: Optional[Tuple[dict, float, int]] = None
+        # Bumped under _write_lock after every committed bet write, so a
+        # stats snapshot raced by a write is never served from the cache.
+        self._write_gen = 0
         self._init_db()
+        self._load_known_event_ids()
+
+        self._closed = threading.Event()
+        threading.Thread(
+            target=self._checkpoint_loop, daemon=True, name="bet-db-checkpoint",
+        ).start()
 
     @contextmanager
     def _connect(self) -> Generator[sqlite3.Connection, None, None]:
-        conn = sqlite3.connect(self._db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Yield the writer connection (callers must hold ``_write_lock``)."""
+        yield self._conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection, opening it on first use."""
+        conn = getattr(self._read_local, "conn", None)
+        if conn is None:
+            uri = Path(self._db_path).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(
+                uri, uri=True, check_same_thread=False, isolation_level=None,
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in _PRAGMAS:
+                conn.execute(pragma)
+            self._read_local.conn = conn
+            self._read_conns.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        """Run the enclosed writes in one ``BEGIN IMMEDIATE`` transaction.
+
+        Callers must hold ``_write_lock``.  Rolls back if the block raises.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Checkpoint the WAL, then close the writer and all reader connections."""
+        self._closed.set()
+        with self._write_lock:
+            for conn in self._read_conns:
+                conn.close()
+            self._read_conns.clear()
+            # wal_autocheckpoint is off, so fold the WAL back in before exit
+            try:
+                self._conn.execute("PRAGMA optimize")
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except Exception as exc:
+                logger.warning("Final optimize/WAL checkpoint failed: %s", exc)
+            self._conn.close()
+
+    def _checkpoint_loop(self) -> None:
+        """Fold the WAL back into the database every few seconds."""
+        while not self._closed.wait(_CHECKPOINT_INTERVAL_SECS):
+            try:
+                with self._write_lock, self._connect() as conn:
+                    if self._closed.is_set():
+                        return
+                    conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            except Exception as exc:
+                logger.warning("WAL checkpoint failed: %s", exc)
 
     def _init_db(self) -> None:
         try:
-            with self._lock, self._connect() as conn:
+            with self._write_lock, self._connect() as conn:
                 conn.execute(_CREATE_TABLE)
+                if _has_text_timestamps(conn):
+                    with self._transaction() as txn:
+                        for stmt in _MIGRATE_TO_EPOCH:
+                            txn.execute(stmt)
+                    logger.info("Migrated bet timestamps to epoch seconds")
+                if not _has_column(conn, "bets", "betfair_bet_id"):
+                    conn.execute(_ADD_BETFAIR_BET_ID)
+                if not _table_exists(conn, "competition_stats"):
+                    with self._transaction() as txn:
+                        txn.execute(_CREATE_COMPETITION_STATS)
+                        txn.execute(_SQL_BACKFILL_COMPETITION_STATS)
+                # WAL is persistent: writes only fsync at checkpoints and
+                # readers never block writers.
+                journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+                for pragma in _PRAGMAS:
+                    conn.execute(pragma)
                 for stmt in _CREATE_INDEXES:
                     conn.execute(stmt)
-                conn.commit()
-            logger.info("Bet database initialised at %s", self._db_path)
-        except Exception as exc:
-            logger.error("Failed to initialise bet database: %s", exc)
+                # Gather planner statistics once; PRAGMA optimize on close()
+                # keeps them current afterwards.
+                if not _table_exists(conn, "sqlite_stat1"):
+                    conn.execute("ANALYZE")
+            logger.info(
+                "Bet database initialised at %s (journal_mode=%s)",
+                self._db_path, journal_mode,
+            )
+        except Exception:
+            logger.exception("Failed to initialise bet database", stacklevel=2)
+
+    def _load_known_event_ids(self) -> None:
+        try:
+            with self._write_lock, self._connect() as conn:
+                self._known_event_ids = {
+                    r["event_id"] for r in conn.execute(_SQL_KNOWN_EVENT_IDS)
+                }
+            logger.debug("Loaded %d known event ids", len(self._known_event_ids))
+        except Exception:
+            logger.exception("Failed to load known event ids", stacklevel=2)
 
     def record_bet(
         self,
@@ -108,67 +436,79 @@ class BetDatabase:
         odds: float,
         stake: float,
         paper_trade: bool,
+        betfair_bet_id: Optional[str] = None,
     ) -> Optional[int]:
         """Insert a new bet record and return its auto-increment id.
 
+        ``betfair_bet_id`` is the id returned by placeOrders for real bets;
+        settlement looks the bet up by it.
+
         Returns ``None`` if the insert fails — the bot continues normally
         as the DB is non-critical.
         """
-        bet_time = datetime.now(timezone.utc)
+        bet_time = int(time.time())
         try:
-            with self._lock, self._connect() as conn:
-                cur = conn.execute(
-                    """
-                    INSERT INTO bets (
-                        event_id, event_name, competition,
-                        market_id, selection_id, selection_name,
-                        odds, stake, bet_time, paper_trade
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        event_id, event_name, competition,
-                        market_id, selection_id, selection_name,
-                        odds, stake, bet_time.isoformat(), int(paper_trade),
-                    ),
+            with self._write_lock:
+                with self._transaction() as conn:
+                    cur = conn.execute(
+                        _SQL_INSERT_BET,
+                        (
+                            event_id, event_name, competition,
+                            market_id, selection_id, selection_name,
+                            odds, stake, bet_time, paper_trade, betfair_bet_id,
+                        ),
+                    )
+                    bet_id = cur.lastrowid
+                    cached = self._today_spend_cache
+                    if (
+                        not paper_trade
+                        and cached is not None
+                        and cached[0] == bet_time // _SECONDS_PER_DAY
+                    ):
+                        self._today_spend_cache = (cached[0], cached[1] + stake)
+                self._write_gen += 1
+            self._known_event_ids.add(event_id)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Bet recorded in DB: id=%d %s %s @ %.2f (stake=%.2f, paper=%s)",
+                    bet_id, event_name, selection_name, odds, stake, paper_trade,
                 )
-                conn.commit()
-                bet_id = cur.lastrowid
-            logger.debug(
-                "Bet recorded in DB: id=%d %s %s @ %.2f (stake=%.2f, paper=%s)",
-                bet_id, event_name, selection_name, odds, stake, paper_trade,
-            )
             return bet_id
-        except Exception as exc:
-            logger.error("Failed to record bet for %s: %s", event_name, exc)
+        except Exception:
+            logger.exception("Failed to record bet for %s", event_name, stacklevel=2)
             return None
 
     def already_bet(self, event_id: str) -> bool:
         """Return True if a bet (paper or real) already exists for this event."""
-        try:
-            with self._lock, self._connect() as conn:
-                row = conn.execute(
-                    "SELECT id FROM bets WHERE event_id = ? LIMIT 1", (event_id,)
-                ).fetchone()
-            return row is not None
-        except Exception as exc:
-            logger.error("Failed to check existing bet for event %s: %s", event_id, exc)
-            return False
+        return event_id in self._known_event_ids
+
+    def already_bet_bulk(self, event_ids: Iterable[str]) -> Set[str]:
+        """Return the subset of ``event_ids`` that already have a bet."""
+        return self._known_event_ids.intersection(event_ids)
 
     def get_today_spend(self) -> float:
-        """Return the total stake placed today (UTC) for real bets only."""
+        """Return the total stake placed today (UTC) for real bets only.
+
+        The value is queried once per UTC day and then kept up to date by
+        :meth:`record_bet`, so repeated calls within a day are free.
+        """
+        today = int(time.time()) // _SECONDS_PER_DAY
+        cached = self._today_spend_cache
+        if cached is not None and cached[0] == today:
+            return cached[1]
+        # A plain epoch range on the raw ``bet_time`` column lets SQLite seek
+        # the index instead of evaluating a date function on every row.
+        bounds = (today * _SECONDS_PER_DAY, (today + 1) * _SECONDS_PER_DAY)
         try:
-            with self._lock, self._connect() as conn:
-                row = conn.execute(
-                    """
-                    SELECT COALESCE(SUM(stake), 0) AS spend
-                    FROM bets
-                    WHERE date(bet_time) = date('now')
-                      AND paper_trade = 0
-                    """
-                ).fetchone()
-            return float(row["spend"])
-        except Exception as exc:
-            logger.error("Failed to compute today's spend: %s", exc)
+            # Held so a concurrent record_bet() cannot slip in between the
+            # SUM and the cache store (which would lose its stake).
+            with self._write_lock:
+                row = self._reader().execute(_SQL_TODAY_SPEND, bounds).fetchone()
+                spend = float(row["spend"])
+                self._today_spend_cache = (today, spend)
+            return spend
+        except Exception:
+            logger.exception("Failed to compute today's spend", stacklevel=2)
             return 0.0
 
     def settle_bet(
@@ -182,104 +522,83 @@ class BetDatabase:
         ``result`` is one of: 'WON', 'LOST', 'VOID'.
         ``profit_loss`` is positive for wins, negative for losses (net of stake).
         """
-        settled_time = datetime.now(timezone.utc)
+        self.settle_bets_bulk([(bet_id, result, profit_loss)])
+
+    def settle_bets_bulk(self, items: List[Tuple[int, str, float]]) -> None:
+        """Settle several bets in a single transaction.
+
+        ``items`` is a list of ``(bet_id, result, profit_loss)`` tuples with
+        the same meaning as the :meth:`settle_bet` arguments.  All rows are
+        committed together (one WAL append instead of one per bet).
+        """
+        if not items:
+            return
+        settled_time = int(time.time())
+        rollup_params = [(profit_loss, bet_id) for bet_id, _, profit_loss in items]
+        params = [
+            (result, profit_loss, settled_time, bet_id)
+            for bet_id, result, profit_loss in items
+        ]
         try:
-            with self._lock, self._connect() as conn:
-                conn.execute(
-                    """
-                    UPDATE bets SET
-                        result       = ?,
-                        profit_loss  = ?,
-                        settled_time = ?,
-                        updated_at   = datetime('now')
-                    WHERE id = ?
-                    """,
-                    (result, profit_loss, settled_time.isoformat(), bet_id),
-                )
-                conn.commit()
-            logger.debug(
-                "Bet settled in DB: id=%d result=%s pnl=%.2f",
-                bet_id, result, profit_loss,
+            with self._write_lock:
+                with self._transaction() as conn:
+                    conn.executemany(_SQL_ROLLUP_COMPETITION, rollup_params)
+                    conn.executemany(_SQL_SETTLE_BET, params)
+                self._write_gen += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                for bet_id, result, profit_loss in items:
+                    logger.debug(
+                        "Bet settled in DB: id=%d result=%s pnl=%.2f",
+                        bet_id, result, profit_loss,
+                    )
+        except Exception:
+            logger.exception(
+                "Failed to settle bets %s",
+                [bet_id for bet_id, _, _ in items],
+                stacklevel=2,
             )
-        except Exception as exc:
-            logger.error("Failed to settle bet id=%d: %s", bet_id, exc)
 
-    def get_pending_bets(self) -> list:
-        """Return all bets without a result (unsettled)."""
+    def get_pending_bets(self, placed_since: int = 0) -> List[PendingBet]:
+        """Return real bets without a result (unsettled).
+
+        ``placed_since`` (epoch seconds) limits the result to bets placed at
+        or after that time; by default every pending bet is returned.
+        """
         try:
-            with self._lock, self._connect() as conn:
-                rows = conn.execute(
-                    """
-                    SELECT id, market_id, selection_id, stake, odds, event_name,
-                           selection_name, paper_trade
-                    FROM bets WHERE result IS NULL AND paper_trade = 0
-                    """
-                ).fetchall()
-            return [dict(r) for r in rows]
-        except Exception as exc:
-            logger.error("Failed to fetch pending bets: %s", exc)
+            # Plain tuples straight into the NamedTuple – skips the
+            # sqlite3.Row → dict copy per row.
+            cur = self._reader().cursor()
+            cur.row_factory = None
+            rows = cur.execute(_SQL_PENDING_BETS, (placed_since,)).fetchall()
+            return [PendingBet._make(r) for r in rows]
+        except Exception:
+            logger.exception("Failed to fetch pending bets", stacklevel=2)
             return []
 
     def get_stats(self) -> dict:
         """Return aggregated statistics from the bet history.
 
+        The result is cached for ``_STATS_CACHE_TTL_SECS`` (or until the next
+        record/settle commits), so repeated /stats commands do not re-aggregate.
         Returns an empty dict on DB error (non-critical).
         """
+        # Read before the query: if a write commits while it runs, the result
+        # is tagged with an older generation and is never served again.
+        write_gen = self._write_gen
+        cached = self._stats_cache
+        if cached is not None and cached[2] == write_gen and time.monotonic() < cached[1]:
+            return cached[0]
         try:
-            with self._lock, self._connect() as conn:
-                row = conn.execute("""
-                    SELECT
-                        COUNT(*)                                             AS total,
-                        COALESCE(SUM(CASE WHEN result='WON' THEN 1 ELSE 0 END), 0) AS wins,
-                        COALESCE(ROUND(
-                            SUM(CASE WHEN result='WON' THEN 1.0 ELSE 0 END)
-                            / NULLIF(COUNT(*), 0) * 100, 1
-                        ), 0)                                               AS win_rate,
-                        COALESCE(ROUND(SUM(profit_loss), 2), 0)            AS total_pnl,
-                        COALESCE(ROUND(AVG(profit_loss), 2), 0)            AS avg_pnl,
-                        COALESCE(ROUND(MAX(profit_loss), 2), 0)            AS best_pnl,
-                        COALESCE(ROUND(MIN(profit_loss), 2), 0)            AS worst_pnl
-                    FROM bets WHERE result IS NOT NULL AND paper_trade = 0
-                """).fetchone()
-
-                open_count = conn.execute(
-                    "SELECT COUNT(*) FROM bets WHERE result IS NULL AND paper_trade = 0"
-                ).fetchone()[0]
-
-                paper_count = conn.execute(
-                    "SELECT COUNT(*) FROM bets WHERE paper_trade = 1"
-                ).fetchone()[0]
-
-                yesterday_row = conn.execute("""
-                    SELECT
-                        COUNT(*) AS bets,
-                        COALESCE(ROUND(SUM(profit_loss), 2), 0) AS pnl
-                    FROM bets
-                    WHERE result IS NOT NULL
-                      AND paper_trade = 0
-                      AND date(bet_time) = date('now', '-1 day')
-                """).fetchone()
-
-                week_row = conn.execute("""
-                    SELECT
-                        COUNT(*) AS bets,
-                        COALESCE(ROUND(SUM(profit_loss), 2), 0) AS pnl
-                    FROM bets
-                    WHERE result IS NOT NULL
-                      AND paper_trade = 0
-                      AND bet_time >= datetime('now', '-7 days')
-                """).fetchone()
-
-                competition_rows = conn.execute("""
-                    SELECT competition,
-                           COUNT(*) AS cnt,
-                           COALESCE(ROUND(SUM(profit_loss), 2), 0) AS pnl
-                    FROM bets
-                    WHERE result IS NOT NULL AND paper_trade = 0
-                    GROUP BY competition
-                """).fetchall()
-
-            return {
+            conn = self._reader()
+            # One read transaction so both queries see the same snapshot.
+            conn.execute("BEGIN")
+            try:
+                row = conn.execute(_SQL_STATS, _stats_time_bounds()).fetchone()
+                competition_rows = conn.execute(_SQL_STATS_BY_COMPETITION).fetchall()
+            finally:
+                conn.execute("COMMIT")
+
+            stats = {
                 "total_settled": row["total"],
                 "wins": row["wins"],
                 "win_rate": row["win_rate"],
@@ -287,17 +606,22 @@ class BetDatabase:
                 "avg_pnl": row["avg_pnl"],
                 "best_pnl": row["best_pnl"],
                 "worst_pnl": row["worst_pnl"],
-                "open_count": open_count,
-                "paper_count": paper_count,
-                "yesterday_bets": yesterday_row["bets"],
-                "yesterday_pnl": yesterday_row["pnl"],
-                "week_bets": week_row["bets"],
-                "week_pnl": week_row["pnl"],
+                "open_count": row["open_count"],
+                "paper_count": row["paper_count"],
+                "yesterday_bets": row["yesterday_bets"],
+                "yesterday_pnl": row["yesterday_pnl"],
+                "week_bets": row["week_bets"],
+                "week_pnl": row["week_pnl"],
                 "by_competition": {
                     r["competition"]: {"count": r["cnt"], "pnl": r["pnl"]}
                     for r in competition_rows
                 },
             }
-        except Exception as exc:
-            logger.error("Failed to query bet stats: %s", exc)
+            if self._write_gen == write_gen:
+                self._stats_cache = (
+                    stats, time.monotonic() + _STATS_CACHE_TTL_SECS, write_gen,
+                )
+            return stats
+        except Exception:
+            logger.exception("Failed to query bet stats", stacklevel=2)
             return {}
@@ -7,28 +7,34 @@ Lifecycle::
 
 The main loop:
 1. Authenticate with Betfair.
-2. Every ``check_interval`` seconds:
-   a. Fetch account balance.
-   b. Compute today's spend from the DB.
-   c. Fetch upcoming events for configured leagues.
-   d. For each event not yet bet on:
-      - Fetch MATCH_ODDS market and runner prices.
+2. Run three jobs, each on its own cadence:
+   a. Every ``check_interval`` seconds, scan for bets (the interval widens
+      while no event is in its snipe window, but never past the moment the
+      next event's window opens):
+      - Fetch account balance and today's spend from the DB.
+      - Fetch upcoming events for configured leagues.
+      - Keep events not yet bet on that are inside the snipe window.
+      - Fetch their MATCH_ODDS markets in batched requests.
       - Apply the strategy to select an outcome within [min_odds, max_odds].
       - Check risk constraints (daily cap, reserve).
       - Place a BACK bet (or log in paper-trading mode).
-3. Poll Telegram commands (/status, /stats, /halt, /resume).
-4. Try to settle pending bets via listClearedOrders.
+   b. Every ``SETTLEMENT_INTERVAL`` seconds, settle pending bets via
+      listClearedOrders.
+   c. Handle Telegram commands (/status, /stats, /halt, /resume) as soon as
+      the notifier's long-poll listener receives them.
 """
 
 from __future__ import annotations
 
 import logging
+import queue
+import threading
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple
 
-from betting.bet_db import BetDatabase
+from betting.bet_db import BetDatabase, PendingBet
 from betting.broker import BetfairBroker, BetEvent, MarketOdds
 from betting.config import BetSniperConfig
 from betting.risk import RiskManager
@@ -41,6 +47,74 @@ STORAGE_DIR = Path("/data")
 BETS_DB_FILE = STORAGE_DIR / "bets.db"
 BETS_LOG_FILE = STORAGE_DIR / "bets.log"
 
+SETTLEMENT_INTERVAL = 60       # seconds between settlement checks
+SETTLEMENT_WINDOW_DAYS = 7     # bets older than this are no longer polled for settlement
+MAX_IDLE_BACKOFF_STEPS = 4     # idle scans double the interval up to 2**4 times
+MAX_SCAN_INTERVAL = 4 * 3600   # never back off beyond this many seconds
+MIN_SCAN_INTERVAL = 30         # floor when tightening for an opening window
+BET_LOG_FLUSH_SECS = 0.1       # bet log lines arriving this close are written together
+BET_LOG_MAX_BATCH = 32
+
+
+class _BetLogWriter:
+    """Append-only writer for ``BETS_LOG_FILE`` running on its own thread.
+
+    The file is opened once and kept open; lines queued within
+    ``BET_LOG_FLUSH_SECS`` of each other are written with a single write,
+    so callers never block on file I/O.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._queue: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="bet-log-writer",
+        )
+        self._thread.start()
+
+    def write(self, line: str) -> None:
+        self._queue.put(line)
+
+    def close(self) -> None:
+        """Flush pending lines and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        f = None
+        stop = False
+        while not stop:
+            line = self._queue.get()
+            batch: List[str] = []
+            deadline = time.monotonic() + BET_LOG_FLUSH_SECS
+            while True:
+                if line is None:
+                    stop = True
+                    break
+                batch.append(line)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= BET_LOG_MAX_BATCH or remaining <= 0:
+                    break
+                try:
+                    line = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if not batch:
+                continue
+            try:
+                if f is None:
+                    f = open(self._path, "a", encoding="utf-8")
+                f.write("\n".join(batch) + "\n")
+                f.flush()
+            except Exception as exc:
+                logger.warning("Could not write bet log: %s", exc)
+                if f is not None:
+                    f.close()
+                    f = None
+        if f is not None:
+            f.close()
+
 
 class BetSniperBot:
     """Autonomous Betfair football betting bot."""
@@ -59,11 +133,22 @@ class BetSniperBot:
             api_key=config.telegram_api_key,
         )
 
+        # Snipe window bounds in seconds before kick-off.
+        self._min_ko_secs = config.min_time_to_ko_minutes * 60
+        self._max_ko_secs = config.bet_window_hours * 3600
+
         self._halt = False
         self._running = False
+        # Adaptive scan scheduling – see _next_scan_delay().
+        self._idle_scans = 0
+        self._next_window_secs: Optional[float] = None
+        # Set by shutdown() and by the Telegram listener to cut the current
+        # wait short.
+        self._wakeup = threading.Event()
 
         STORAGE_DIR.mkdir(parents=True, exist_ok=True)
         self._bet_db = BetDatabase(BETS_DB_FILE)
+        self._bet_log = _BetLogWriter(BETS_LOG_FILE)
 
     # ------------------------------------------------------------------
     # Public API
@@ -75,7 +160,17 @@ class BetSniperBot:
         logger.info("Bet Sniper Bot starting …")
 
         self._telegram.start_keepalive()
+        self._telegram.start_command_listener(on_command=self._wakeup.set)
 
+        try:
+            self._run_loop()
+        finally:
+            # Runs on the main thread once the loop has unwound, so no write
+            # or bet-log line is still in flight
+            self._bet_log.close()
+            self._bet_db.close()
+
+    def _run_loop(self) -> None:
         if not self._broker.connect():
             logger.error("Cannot connect to Betfair. Exiting.")
             return
@@ -87,31 +182,71 @@ class BetSniperBot:
             )
 
         mode_label = "PAPER" if self._config.paper_trading else "LIVE"
-        self._telegram.notify(
+        self._telegram.notify_lazy(lambda: (
             f"🎯 <b>Bet Sniper Bot started</b> [{mode_label}]\n"
             f"Leagues: {', '.join(self._config.leagues)}\n"
             f"Odds range: {self._config.min_odds:.2f}–{self._config.max_odds:.2f}\n"
             f"Stake: {self._config.stake_per_bet:.2f} | "
             f"Daily cap: {self._config.max_daily_loss_pct:.0f}% | "
             f"Reserve: {self._config.reserve_pct:.0f}%"
-        )
+        ))
 
+        # Each job keeps its own deadline on the monotonic clock; commands are
+        # drained on every wake-up (a local queue read, no network).
+        next_scan = next_settle = time.monotonic()
         while self._running:
-            try:
+            now = time.monotonic()
+            if now >= next_scan:
                 if not self._halt:
-                    self._run_cycle()
-                    self._settle_pending_bets()
-                self._process_telegram_commands()
-            except Exception as exc:
-                logger.error("Unexpected error in main loop: %s", exc, exc_info=True)
+                    self._run_job("bet scan", self._run_cycle)
+                delay = self._next_scan_delay()
+                # Anchored to the scan's start, not its end, so the cadence
+                # does not drift by the scan's own duration.
+                next_scan = now + delay
+                overrun = time.monotonic() - next_scan
+                if overrun > 0:
+                    logger.warning(
+                        "Bet scan overran its %.0fs interval by %.1fs",
+                        delay, overrun,
+                    )
+                else:
+                    logger.debug("Next bet scan in %.0f seconds", -overrun)
+            if now >= next_settle:
+                next_settle = now + SETTLEMENT_INTERVAL
+                if not self._halt:
+                    self._run_job("settlement", self._settle_pending_bets)
+            self._run_job("command handling", self._process_telegram_commands)
 
-            logger.debug("Sleeping for %d seconds …", self._config.check_interval)
-            time.sleep(self._config.check_interval)
+            wait = min(next_scan, next_settle) - time.monotonic()
+            self._wakeup.wait(max(0.0, wait))
+            self._wakeup.clear()
 
     def shutdown(self) -> None:
         """Signal the main loop to stop gracefully."""
         logger.info("Shutting down Bet Sniper Bot …")
         self._running = False
+        self._wakeup.set()
+
+    def _run_job(self, name: str, job: Callable[[], None]) -> None:
+        try:
+            job()
+        except Exception as exc:
+            logger.error("Unexpected error in %s: %s", name, exc, exc_info=True)
+
+    def _next_scan_delay(self) -> float:
+        """Return the seconds to wait before the next bet scan.
+
+        Each consecutive scan with nothing in its snipe window doubles the
+        interval (up to ``MAX_IDLE_BACKOFF_STEPS`` times, capped at
+        ``MAX_SCAN_INTERVAL``).  The delay is then clamped so the next scan
+        happens no later than the moment the next event's window opens.
+        """
+        base = self._config.check_interval
+        backoff = 2 ** min(self._idle_scans, MAX_IDLE_BACKOFF_STEPS)
+        delay = min(base * backoff, max(base, MAX_SCAN_INTERVAL))
+        if self._next_window_secs is not None:
+            delay = min(delay, max(self._next_window_secs, MIN_SCAN_INTERVAL))
+        return delay
 
     # ------------------------------------------------------------------
     # Core cycle
@@ -120,6 +255,7 @@ class BetSniperBot:
     def _run_cycle(self) -> None:
         """Scan events and place qualifying bets for this cycle."""
         logger.info("=== Starting bet scan cycle ===")
+        self._next_window_secs = None
 
         balance = self._config.virtual_balance if self._config.paper_trading else self._broker.get_balance()
         today_spend = self._bet_db.get_today_spend()
@@ -136,24 +272,44 @@ class BetSniperBot:
 
         if not events:
             logger.info("No upcoming events found for configured leagues.")
+            self._idle_scans += 1
             return
 
-        bets_this_cycle = 0
+        # Cheap local filters first, so only in-window events hit Betfair.
+        now = datetime.now(timezone.utc)
+        # Checked once per scan: skips building debug arguments per event.
+        debug = logger.isEnabledFor(logging.DEBUG)
+        already_bet = self._bet_db.already_bet_bulk(event.id for event in events)
+        candidates: List[BetEvent] = []
         for event in events:
-            if not self._running or self._halt:
-                break
-
-            if self._bet_db.already_bet(event.id):
-                logger.debug("Already bet on event %s (%s), skipping.", event.id, event.name)
+            if event.id in already_bet:
+                if debug:
+                    logger.debug("Already bet on event %s (%s), skipping.", event.id, event.name)
                 continue
-
-            if not self._is_in_snipe_window(event):
+            if self._is_in_snipe_window(event, now):
+                candidates.append(event)
                 continue
+            opens_in = self._secs_to_kick_off(event, now) - self._max_ko_secs
+            if opens_in > 0 and (
+                self._next_window_secs is None or opens_in < self._next_window_secs
+            ):
+                self._next_window_secs = opens_in
+
+        self._idle_scans = 0 if candidates else self._idle_scans + 1
 
-            market = self._broker.get_match_odds(event.id)
+        # One batched lookup for every candidate instead of a round-trip each.
+        markets = self._broker.get_match_odds_batch([event.id for event in candidates])
+
+        bets_this_cycle = 0
+        for event in candidates:
+            if not self._running or self._halt:
+                break
+
+            market = markets.get(event.id)
 
             if market is None:
-                logger.debug("No MATCH_ODDS market for %s", event.name)
+                if debug:
+                    logger.debug("No MATCH_ODDS market for %s", event.name)
                 continue
 
             selection = self._strategy.select_outcome(
@@ -163,10 +319,11 @@ class BetSniperBot:
             )
 
             if selection is None:
-                logger.debug(
-                    "No qualifying selection for %s (odds range %.2f–%.2f)",
-                    event.name, self._config.min_odds, self._config.max_odds,
-                )
+                if debug:
+                    logger.debug(
+                        "No qualifying selection for %s (odds range %.2f–%.2f)",
+                        event.name, self._config.min_odds, self._config.max_odds,
+                    )
                 continue
 
             if not self._risk.can_place_bet(
@@ -184,7 +341,7 @@ class BetSniperBot:
                     )
                 break
 
-            self._place_or_paper_bet(event, market.market_id, selection)
+            self._place_or_paper_bet(event, market.market_id, selection, now)
             today_spend += self._config.stake_per_bet
             bets_this_cycle += 1
 
@@ -195,8 +352,12 @@ class BetSniperBot:
         event: BetEvent,
         market_id: str,
         selection: Selection,
+        now: Optional[datetime] = None,
     ) -> None:
-        """Place a real bet or log a paper bet."""
+        """Place a real bet or log a paper bet.
+
+        ``now`` is the scan's timestamp, reused for the bet log line.
+        """
         stake = self._config.stake_per_bet
 
         if self._config.paper_trading:
@@ -215,7 +376,7 @@ class BetSniperBot:
                 stake=stake,
                 paper_trade=True,
             )
-            self._log_bet(event, selection, stake, paper=True)
+            self._log_bet(event, selection, stake, paper=True, now=now)
             return
 
         placed = self._broker.place_back_bet(
@@ -239,15 +400,16 @@ class BetSniperBot:
             odds=selection.odds,
             stake=stake,
             paper_trade=False,
+            betfair_bet_id=placed.bet_id,
         )
-        self._log_bet(event, selection, stake, paper=False)
-        self._telegram.notify(
+        self._log_bet(event, selection, stake, paper=False, now=now)
+        self._telegram.notify_lazy(lambda: (
             f"✅ <b>Bet placed</b>\n"
             f"Match: <b>{event.name}</b>\n"
             f"Competition: {event.competition}\n"
             f"Selection: <b>{selection.name}</b> @ {selection.odds:.2f}\n"
             f"Stake: {stake:.2f} | Bet ID: <code>{placed.bet_id}</code>"
-        )
+        ))
 
     # ------------------------------------------------------------------
     # Settlement
@@ -258,30 +420,51 @@ class BetSniperBot:
         if self._config.paper_trading:
             return
 
-        pending = self._bet_db.get_pending_bets()
+        # Football markets settle within a day or two of kick-off; anything
+        # still open after a week (e.g. a lapsed, never-matched order) would
+        # otherwise be re-requested forever.
+        placed_since = int(time.time()) - SETTLEMENT_WINDOW_DAYS * 86400
+        pending = self._bet_db.get_pending_bets(placed_since)
         if not pending:
             return
 
-        bet_ids = [str(row["id"]) for row in pending]
-
-        # We need the actual Betfair bet IDs, which are stored as selection_id
-        # in our DB.  Use listClearedOrders by market_id grouping instead.
-        market_ids_to_db: Dict[str, dict] = {row["market_id"]: row for row in pending}
+        by_bet_id: Dict[str, PendingBet] = {}
+        # Rows recorded before the Betfair bet id was stored can only be
+        # matched on their market and runner.
+        legacy: Dict[Tuple[str, int], PendingBet] = {}
+        for row in pending:
+            if row.betfair_bet_id:
+                by_bet_id[row.betfair_bet_id] = row
+            else:
+                legacy[(row.market_id, row.selection_id)] = row
+
+        matched = []
+        if by_bet_id:
+            for s in self._broker.get_settled_bets(bet_ids=list(by_bet_id)):
+                db_row = by_bet_id.get(s.bet_id)
+                if db_row is not None:
+                    matched.append((db_row, s))
+        if legacy:
+            market_ids = list({market_id for market_id, _ in legacy})
+            for s in self._broker.get_settled_bets(market_ids=market_ids):
+                db_row = legacy.pop((s.market_id, s.selection_id), None)
+                if db_row is not None:
+                    matched.append((db_row, s))
+
+        if not matched:
+            return
 
-        settled = self._broker.get_settled_bets(bet_ids)
-        for s in settled:
-            db_row = market_ids_to_db.get(s.market_id)
-            if db_row is None:
-                continue
-            self._bet_db.settle_bet(
-                bet_id=db_row["id"],
-                result=s.result,
-                profit_loss=s.profit_loss,
-            )
+        # One transaction for the whole batch of settlements.
+        self._bet_db.settle_bets_bulk(
+            [(db_row.id, s.result, s.profit_loss) for db_row, s in matched]
+        )
+        if not self._telegram.enabled:
+            return
+        for db_row, s in matched:
             icon = "✅" if s.result == "WON" else ("↩️" if s.result == "VOID" else "❌")
             self._telegram.notify(
-                f"{icon} <b>Bet settled</b>: {db_row['event_name']} – "
-                f"{db_row['selection_name']} → <b>{s.result}</b> "
+                f"{icon} <b>Bet settled</b>: {db_row.event_name} – "
+                f"{db_row.selection_name} → <b>{s.result}</b> "
                 f"(P&amp;L: {s.profit_loss:+.2f})"
             )
 
@@ -352,8 +535,9 @@ class BetSniperBot:
 
         wins = s["wins"]
         losses = total - wins
+        # Bets without a competition are rolled up under the empty string
         comp_lines = [
-            f"   • {comp}: {d['count']} bets ({d['pnl']:+.2f})"
+            f"   • {comp or 'Unknown'}: {d['count']} bets ({d['pnl']:+.2f})"
             for comp, d in s["by_competition"].items()
         ]
 
@@ -387,7 +571,17 @@ class BetSniperBot:
     # Snipe window
     # ------------------------------------------------------------------
 
-    def _is_in_snipe_window(self, event: BetEvent) -> bool:
+    @staticmethod
+    def _secs_to_kick_off(event: BetEvent, now: Optional[datetime] = None) -> float:
+        """Return seconds from ``now`` (default: current UTC time) to kick-off."""
+        if now is None:
+            now = datetime.now(timezone.utc)
+        kick_off = event.kick_off
+        if kick_off.tzinfo is None:
+            kick_off = kick_off.replace(tzinfo=timezone.utc)
+        return (kick_off - now).total_seconds()
+
+    def _is_in_snipe_window(self, event: BetEvent, now: Optional[datetime] = None) -> bool:
         """Return True only if kick-off falls inside the configured snipe window.
 
         The window is defined by two config parameters:
@@ -398,19 +592,16 @@ class BetSniperBot:
         Events too far in the future are *monitored* but not bet on yet.
         Events that are about to kick off (< min_time_to_ko_minutes) are skipped
         to avoid last-second surprises (line-up changes, suspensions, etc.).
-        """
-        now = datetime.now(timezone.utc)
-        kick_off = event.kick_off
-        if kick_off.tzinfo is None:
-            kick_off = kick_off.replace(tzinfo=timezone.utc)
 
-        time_to_ko_secs = (kick_off - now).total_seconds()
-        min_secs = self._config.min_time_to_ko_minutes * 60
-        max_secs = self._config.bet_window_hours * 3600
+        ``now`` lets a caller checking many events share one timestamp.
+        """
+        time_to_ko_secs = self._secs_to_kick_off(event, now)
+        min_secs = self._min_ko_secs
+        max_secs = self._max_ko_secs
 
         in_window = min_secs <= time_to_ko_secs <= max_secs
 
-        if not in_window:
+        if not in_window and logger.isEnabledFor(logging.DEBUG):
             if time_to_ko_secs > max_secs:
                 logger.debug(
                     "Too early to bet on '%s' (KO in %.1fh, window opens at %.1fh).",
@@ -438,16 +629,14 @@ class BetSniperBot:
         selection: Selection,
         stake: float,
         paper: bool,
+        now: Optional[datetime] = None,
     ) -> None:
-        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        if now is None:
+            now = datetime.now(timezone.utc)
         tag = "PAPER" if paper else "REAL "
         line = (
-            f"{now} UTC | {tag} | {event.name:<35} | {event.competition:<25} | "
+            f"{now:%Y-%m-%d %H:%M:%S} UTC | {tag} | {event.name:<35} | {event.competition:<25} | "
             f"{selection.name:<10} @ {selection.odds:.2f} | stake={stake:.2f}"
         )
-        try:
-            with open(BETS_LOG_FILE, "a") as f:
-                f.write(line + "\n")
-        except Exception as exc:
-            logger.warning("Could not write bet log: %s", exc)
+        self._bet_log.write(line)
 
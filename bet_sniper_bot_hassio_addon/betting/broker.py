@@ -14,18 +14,27 @@ Key Betfair concepts
 League → Betfair competition name mapping
 -----------------------------------------
 We resolve each configured league slug (e.g. "soccer_italy_serie_a") to the
-Betfair competition name used in ``listCompetitions`` / ``listEvents``.
+Betfair competition name returned by ``listCompetitions``, whose id then
+filters the ``listMarketCatalogue`` event lookup.
 """
 
 from __future__ import annotations
 
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 import betfairlightweight
+import requests
 from betfairlightweight import filters as bf_filters
+from betfairlightweight.exceptions import KeepAliveError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from betting.strategy import Runner
 
@@ -47,8 +56,32 @@ LEAGUE_COMPETITIONS: Dict[str, str] = {
 
 FOOTBALL_EVENT_TYPE_ID = "1"
 
+# Markets per listMarketBook request (keeps EX_BEST_OFFERS under the
+# Betfair request-weight limit).
+MARKET_BOOK_BATCH_SIZE = 40
+# Ids per listClearedOrders request (the API maximum).
+CLEARED_ORDERS_BATCH_SIZE = 1000
+# Batches sent concurrently when a call needs several requests.
+REQUEST_WORKERS = 4
 
-@dataclass
+# Fixtures per listMarketCatalogue event lookup (the API maximum).
+MAX_CATALOGUE_RESULTS = 1000
+
+BALANCE_CACHE_TTL = 30      # seconds
+EVENTS_CACHE_TTL = 600      # seconds
+COMPETITIONS_CACHE_TTL = 24 * 3600   # seconds
+# listCompetitions only returns competitions with open markets, so a list
+# missing a configured league (off-season, between cup rounds) is re-fetched
+# much sooner.
+COMPETITIONS_PARTIAL_CACHE_TTL = 1800   # seconds
+
+# A session confirmed alive this recently is trusted without another
+# keepAlive round-trip (well under the shortest Betfair session timeout).
+KEEP_ALIVE_INTERVAL = 300   # seconds
+KEEP_ALIVE_RETRY_DELAY = 0.2   # seconds before retrying a failed keepAlive
+
+
+@dataclass(frozen=True, slots=True)
 class BetEvent:
     """Minimal event data needed by the bot."""
 
@@ -58,7 +91,7 @@ class BetEvent:
     kick_off: datetime
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MarketOdds:
     """Current MATCH_ODDS market data for an event."""
 
@@ -67,7 +100,7 @@ class MarketOdds:
     runners: List[Runner]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PlacedBet:
     """Result of a successful place_back_bet call."""
 
@@ -79,7 +112,7 @@ class PlacedBet:
     status: str   # "SUCCESS" | "FAILURE"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SettledBet:
     """Settlement data for a previously placed bet."""
 
@@ -90,6 +123,48 @@ class SettledBet:
     result: str   # "WON" | "LOST" | "VOID"
 
 
+@lru_cache(maxsize=None)
+def _competition_names(leagues: Tuple[str, ...]) -> FrozenSet[str]:
+    """Map configured league slugs to Betfair competition names.
+
+    Cached per league tuple, so unknown slugs are reported once rather than
+    on every event refresh.
+    """
+    unknown = [lg for lg in leagues if lg not in LEAGUE_COMPETITIONS]
+    if unknown:
+        logger.warning("Ignoring unrecognised leagues in config: %s", unknown)
+    return frozenset(
+        LEAGUE_COMPETITIONS[lg] for lg in leagues if lg in LEAGUE_COMPETITIONS
+    )
+
+
+def _market_odds(market_cat, book) -> MarketOdds:
+    """Build :class:`MarketOdds` from a market catalogue entry and its book."""
+    # Map selection_id → runner name from catalogue
+    id_to_name: Dict[int, str] = {}
+    if market_cat.runners:
+        for r in market_cat.runners:
+            id_to_name[r.selection_id] = r.runner_name
+
+    runners: List[Runner] = []
+    for runner in book.runners:
+        name = id_to_name.get(runner.selection_id, str(runner.selection_id))
+        best_back = 0.0
+        if runner.ex and runner.ex.available_to_back:
+            best_back = float(runner.ex.available_to_back[0].price)
+        runners.append(Runner(
+            selection_id=runner.selection_id,
+            name=name,
+            best_back_price=best_back,
+        ))
+
+    return MarketOdds(
+        market_id=market_cat.market_id,
+        event_id=market_cat.event.id,
+        runners=runners,
+    )
+
+
 class BetfairBroker:
     """Thin wrapper around betfairlightweight.APIClient.
 
@@ -102,6 +177,40 @@ class BetfairBroker:
         self._password = password
         self._app_key = app_key
         self._client: Optional[betfairlightweight.APIClient] = None
+        # Without a session betfairlightweight opens a fresh TCP + TLS
+        # connection for every request.  One pooled session, kept across
+        # re-logins, reuses them; the pool is sized for the concurrent
+        # listMarketBook batches plus the main loop.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_maxsize=REQUEST_WORKERS + 1,
+            # Only failures to *open* a connection are retried: nothing has
+            # been sent yet, so this is safe even for placeOrders.
+            max_retries=Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.3),
+        )
+        self._session.mount("https://", adapter)
+        # Calls may come from several worker threads at once; only one of
+        # them should (re-)authenticate.
+        self._connect_lock = threading.Lock()
+        # Monotonic time of the last successful login / keepAlive.
+        self._session_checked_at = 0.0
+        # (value, monotonic expiry) – see get_balance() / get_upcoming_events().
+        self._balance_cache: Optional[Tuple[float, float]] = None
+        self._events_cache: Dict[Tuple, Tuple[List[BetEvent], float]] = {}
+        # Held while an event refresh is in flight, so concurrent callers
+        # wait for its result instead of issuing the same lookup again.
+        self._events_lock = threading.Lock()
+        # event id → its MATCH_ODDS catalogue entry (market id, event and
+        # runner names).  Replaced on every event refresh, so fixtures that
+        # have kicked off drop out; see get_match_odds_batch().
+        self._match_odds_markets: Dict[str, Any] = {}
+        # ({competition name: id}, monotonic expiry) – see _competition_ids().
+        self._competitions_cache: Optional[Tuple[Dict[str, str], float]] = None
+        # Worker threads are only spawned the first time several
+        # listMarketBook / listClearedOrders batches are in flight at once.
+        self._request_pool = ThreadPoolExecutor(
+            max_workers=REQUEST_WORKERS, thread_name_prefix="betfair",
+        )
 
     # ------------------------------------------------------------------
     # Connection
@@ -114,8 +223,10 @@ class BetfairBroker:
                 username=self._username,
                 password=self._password,
                 app_key=self._app_key,
+                session=self._session,
             )
             self._client.login()
+            self._session_checked_at = time.monotonic()
             logger.info("Connected to Betfair as %s", self._username)
             return True
         except Exception as exc:
@@ -124,13 +235,30 @@ class BetfairBroker:
             return False
 
     def _ensure_connected(self) -> bool:
-        """Re-authenticate if the session has expired."""
-        if self._client is None:
-            return self.connect()
-        try:
-            self._client.keep_alive()
-            return True
-        except Exception:
+        """Re-authenticate if the session has expired.
+
+        The session is only re-checked with keepAlive every
+        ``KEEP_ALIVE_INTERVAL`` seconds.  A rejected keepAlive means the
+        session is gone and triggers a new login; a network error is retried
+        once first, so a single dropped connection does not cost a login.
+        """
+        with self._connect_lock:
+            if self._client is None:
+                return self.connect()
+            if time.monotonic() - self._session_checked_at < KEEP_ALIVE_INTERVAL:
+                return True
+            for attempt in range(2):
+                try:
+                    self._client.keep_alive()
+                    self._session_checked_at = time.monotonic()
+                    return True
+                except KeepAliveError as exc:
+                    logger.info("Betfair session expired (%s) – logging in again", exc)
+                    break
+                except Exception as exc:
+                    logger.warning("Betfair keepAlive failed: %s", exc)
+                    if attempt == 0:
+                        time.sleep(KEEP_ALIVE_RETRY_DELAY)
             return self.connect()
 
     # ------------------------------------------------------------------
@@ -138,14 +266,22 @@ class BetfairBroker:
     # ------------------------------------------------------------------
 
     def get_balance(self) -> float:
-        """Return available funds (wallet) or 0.0 on error."""
+        """Return available funds (wallet) or 0.0 on error.
+
+        The value is cached for ``BALANCE_CACHE_TTL`` seconds and invalidated
+        whenever a bet is placed.
+        """
+        cached = self._balance_cache
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
         if not self._ensure_connected():
             return 0.0
         try:
             funds = self._client.account.get_account_funds()
-            balance = funds.available_to_bet_balance
+            balance = float(funds.available_to_bet_balance)
             logger.debug("Betfair balance: %.2f", balance)
-            return float(balance)
+            self._balance_cache = (balance, time.monotonic() + BALANCE_CACHE_TTL)
+            return balance
         except Exception as exc:
             logger.error("Failed to fetch account balance: %s", exc)
             return 0.0
@@ -161,145 +297,199 @@ class BetfairBroker:
     ) -> List[BetEvent]:
         """Return upcoming football events for the configured leagues.
 
-        Filters by competition name derived from the league slug.
+        Filters by competition name derived from the league slug.  Fixtures
+        change on a scale of hours, so results are cached for
+        ``EVENTS_CACHE_TTL`` seconds; failed lookups are not cached.
+        Concurrent cache misses share a single Betfair lookup.
         """
+        key = (tuple(leagues), lookahead_hours)
+        cached = self._events_cache.get(key)
+        if cached is not None and cached[1] > time.monotonic():
+            return list(cached[0])
+
+        with self._events_lock:
+            # Another caller may have refreshed the entry while we waited.
+            cached = self._events_cache.get(key)
+            if cached is not None and cached[1] > time.monotonic():
+                return list(cached[0])
+            events = self._fetch_upcoming_events(leagues, lookahead_hours)
+            if events is None:
+                return []
+            self._events_cache[key] = (events, time.monotonic() + EVENTS_CACHE_TTL)
+        return list(events)
+
+    def _fetch_upcoming_events(
+        self,
+        leagues: List[str],
+        lookahead_hours: int,
+    ) -> Optional[List[BetEvent]]:
+        """Query Betfair for upcoming events; ``None`` on error."""
         if not self._ensure_connected():
-            return []
+            return None
 
-        competition_names = [
-            LEAGUE_COMPETITIONS[lg]
-            for lg in leagues
-            if lg in LEAGUE_COMPETITIONS
-        ]
+        competition_names = _competition_names(tuple(leagues))
         if not competition_names:
-            logger.warning("No recognised leagues in config: %s", leagues)
             return []
 
         now = datetime.now(timezone.utc)
         end = now + timedelta(hours=lookahead_hours)
 
         try:
-            # 1. Resolve competition IDs from names
-            comp_results = self._client.betting.list_competitions(
-                filter=bf_filters.market_filter(
-                    event_type_ids=[FOOTBALL_EVENT_TYPE_ID],
-                    market_start_time=bf_filters.time_range(
-                        from_=now.isoformat(),
-                        to=end.isoformat(),
-                    ),
-                )
-            )
-            comp_id_map: Dict[str, str] = {}   # name → id
-            for cr in comp_results:
-                if cr.competition and cr.competition.name in competition_names:
-                    comp_id_map[cr.competition.name] = cr.competition.id
-
-            if not comp_id_map:
+            # 1. Resolve competition IDs from names (cached – ids never change)
+            competition_ids = self._competition_ids(competition_names)
+            if competition_ids is None:
+                return None
+            if not competition_ids:
                 logger.info(
-                    "No Betfair competitions found for: %s", competition_names
+                    "No Betfair competitions found for: %s", sorted(competition_names)
                 )
                 return []
 
-            # 2. List events for the resolved competitions
-            events_result = self._client.betting.list_events(
+            # 2. One MATCH_ODDS market per fixture, with its event and
+            #    competition inline – no separate listEvents round-trip.
+            catalogue = self._client.betting.list_market_catalogue(
                 filter=bf_filters.market_filter(
                     event_type_ids=[FOOTBALL_EVENT_TYPE_ID],
-                    competition_ids=list(comp_id_map.values()),
+                    competition_ids=competition_ids,
+                    market_type_codes=["MATCH_ODDS"],
                     market_start_time=bf_filters.time_range(
                         from_=now.isoformat(),
                         to=end.isoformat(),
                     ),
-                )
+                ),
+                # All zero-weight projections, so the full 1000 results are
+                # allowed; runner names are kept for get_match_odds_batch().
+                market_projection=["EVENT", "COMPETITION", "RUNNER_DESCRIPTION"],
+                sort="FIRST_TO_START",
+                max_results=MAX_CATALOGUE_RESULTS,
             )
 
             bet_events: List[BetEvent] = []
-            for er in events_result:
-                ev = er.event
+            markets: Dict[str, Any] = {}
+            for cat in catalogue or []:
+                ev = cat.event
                 if not ev:
                     continue
-                comp_name = ev.competition_id or ""
-                # Resolve competition display name from id
-                for name, cid in comp_id_map.items():
-                    if cid == ev.competition_id or cid == getattr(ev, "competition_id", None):
-                        comp_name = name
-                        break
+                markets[ev.id] = cat
                 bet_events.append(BetEvent(
                     id=ev.id,
                     name=ev.name,
-                    competition=comp_name,
-                    kick_off=ev.open_date or now,
+                    competition=cat.competition.name if cat.competition else "",
+                    kick_off=ev.open_date or cat.market_start_time or now,
                 ))
 
+            self._match_odds_markets = markets
             logger.info(
                 "Found %d upcoming events across %d competitions",
-                len(bet_events), len(comp_id_map),
+                len(bet_events), len(competition_ids),
             )
             return bet_events
 
         except Exception as exc:
             logger.error("Failed to fetch upcoming events: %s", exc)
-            return []
-
-    def get_match_odds(self, event_id: str) -> Optional[MarketOdds]:
-        """Return the MATCH_ODDS market for the given event, with runner prices."""
-        if not self._ensure_connected():
             return None
-        try:
-            # 1. Find the MATCH_ODDS market for this event
-            catalogue = self._client.betting.list_market_catalogue(
-                filter=bf_filters.market_filter(
-                    event_ids=[event_id],
-                    market_type_codes=["MATCH_ODDS"],
-                ),
-                market_projection=["RUNNERS"],
-                max_results=1,
-            )
-            if not catalogue:
-                logger.debug("No MATCH_ODDS market found for event %s", event_id)
-                return None
 
-            market_cat = catalogue[0]
-            market_id = market_cat.market_id
+    def _competition_ids(self, competition_names: FrozenSet[str]) -> Optional[List[str]]:
+        """Return the Betfair ids of the named football competitions.
 
-            # 2. Fetch live prices
-            market_books = self._client.betting.list_market_book(
-                market_ids=[market_id],
-                price_projection=bf_filters.price_projection(
-                    price_data=bf_filters.price_data("EX_BEST_OFFERS"),
-                ),
-            )
-            if not market_books:
+        The full football competition list is fetched at most once per
+        ``COMPETITIONS_CACHE_TTL`` when it contains every requested name, and
+        once per ``COMPETITIONS_PARTIAL_CACHE_TTL`` otherwise; ``None`` on error.
+        """
+        cached = self._competitions_cache
+        if cached is None or cached[1] <= time.monotonic():
+            try:
+                comp_results = self._client.betting.list_competitions(
+                    filter=bf_filters.market_filter(
+                        event_type_ids=[FOOTBALL_EVENT_TYPE_ID],
+                    )
+                )
+            except Exception as exc:
+                logger.error("Failed to fetch competitions: %s", exc)
                 return None
+            by_name: Dict[str, str] = {
+                cr.competition.name: cr.competition.id
+                for cr in comp_results
+                if cr.competition
+            }
+            ttl = (
+                COMPETITIONS_CACHE_TTL
+                if competition_names <= by_name.keys()
+                else COMPETITIONS_PARTIAL_CACHE_TTL
+            )
+            cached = (by_name, time.monotonic() + ttl)
+            self._competitions_cache = cached
+        by_name = cached[0]
+        return [by_name[name] for name in competition_names if name in by_name]
 
-            book = market_books[0]
-
-            # Map selection_id → runner name from catalogue
-            id_to_name: Dict[int, str] = {}
-            if market_cat.runners:
-                for r in market_cat.runners:
-                    id_to_name[r.selection_id] = r.runner_name
-
-            runners: List[Runner] = []
-            for runner in book.runners:
-                name = id_to_name.get(runner.selection_id, str(runner.selection_id))
-                best_back = 0.0
-                if runner.ex and runner.ex.available_to_back:
-                    best_back = float(runner.ex.available_to_back[0].price)
-                runners.append(Runner(
-                    selection_id=runner.selection_id,
-                    name=name,
-                    best_back_price=best_back,
-                ))
+    def get_match_odds(self, event_id: str) -> Optional[MarketOdds]:
+        """Return the MATCH_ODDS market for the given event, with runner prices."""
+        return self.get_match_odds_batch([event_id]).get(event_id)
 
-            return MarketOdds(
-                market_id=market_id,
-                event_id=event_id,
-                runners=runners,
-            )
+    def get_match_odds_batch(self, event_ids: List[str]) -> Dict[str, MarketOdds]:
+        """Return the MATCH_ODDS markets for several events, keyed by event id.
+
+        Markets already seen by :meth:`get_upcoming_events` are reused; one
+        ``listMarketCatalogue`` call resolves any others.  Prices are then
+        fetched with ``listMarketBook`` in chunks of ``MARKET_BOOK_BATCH_SIZE``
+        – ⌈N/40⌉ round-trips instead of 2·N, issued concurrently (up to
+        ``REQUEST_WORKERS`` at a time) when there is more than one.
+        Events without a market are simply missing from the result.
+        """
+        if not event_ids or not self._ensure_connected():
+            return {}
+        try:
+            # 1. Find the MATCH_ODDS market of every event
+            known = self._match_odds_markets
+            catalogue = [known[eid] for eid in event_ids if eid in known]
+            missing = [eid for eid in event_ids if eid not in known]
+            if missing:
+                catalogue.extend(self._client.betting.list_market_catalogue(
+                    filter=bf_filters.market_filter(
+                        event_ids=missing,
+                        market_type_codes=["MATCH_ODDS"],
+                    ),
+                    market_projection=["EVENT", "RUNNER_DESCRIPTION"],
+                    max_results=len(missing),
+                ) or [])
+            if not catalogue:
+                logger.debug("No MATCH_ODDS markets found for %d events", len(event_ids))
+                return {}
+            catalogue_by_market = {cat.market_id: cat for cat in catalogue}
+
+            # 2. Fetch live prices, a batch of markets per request
+            market_ids = list(catalogue_by_market)
+            chunks = [
+                market_ids[i:i + MARKET_BOOK_BATCH_SIZE]
+                for i in range(0, len(market_ids), MARKET_BOOK_BATCH_SIZE)
+            ]
+            if len(chunks) == 1:
+                book_batches = [self._list_market_book(chunks[0])]
+            else:
+                book_batches = list(self._request_pool.map(self._list_market_book, chunks))
+
+            result: Dict[str, MarketOdds] = {}
+            for market_books in book_batches:
+                for book in market_books or []:
+                    market_cat = catalogue_by_market.get(book.market_id)
+                    if market_cat is None or market_cat.event is None:
+                        continue
+                    odds = _market_odds(market_cat, book)
+                    result[odds.event_id] = odds
+            return result
 
         except Exception as exc:
-            logger.error("Failed to fetch match odds for event %s: %s", event_id, exc)
-            return None
+            logger.error("Failed to fetch match odds for %d events: %s", len(event_ids), exc)
+            return {}
+
+    def _list_market_book(self, market_ids: List[str]):
+        """Fetch best available prices for one batch of markets."""
+        return self._client.betting.list_market_book(
+            market_ids=market_ids,
+            price_projection=bf_filters.price_projection(
+                price_data=bf_filters.price_data("EX_BEST_OFFERS"),
+            ),
+        )
 
     # ------------------------------------------------------------------
     # Order placement
@@ -352,6 +542,8 @@ class BetfairBroker:
                 return None
 
             bet_id = report.bet_id
+            # Funds just moved: force the next get_balance() to refetch.
+            self._balance_cache = None
             logger.info(
                 "Bet placed: id=%s market=%s sel=%d odds=%.2f stake=%.2f",
                 bet_id, market_id, selection_id, odds, stake,
@@ -376,31 +568,68 @@ class BetfairBroker:
     # Settlement
     # ------------------------------------------------------------------
 
-    def get_settled_bets(self, bet_ids: List[str]) -> List[SettledBet]:
-        """Fetch settlement data for a list of bet IDs.
-
-        Uses ``listClearedOrders`` with ``SETTLED`` status.
-        Returns an empty list on error.
+    def get_settled_bets(
+        self,
+        bet_ids: Optional[List[str]] = None,
+        market_ids: Optional[List[str]] = None,
+    ) -> List[SettledBet]:
+        """Fetch settlement data for the given bet IDs and/or market IDs.
+
+        Uses ``listClearedOrders`` with ``SETTLED`` status; Betfair applies
+        both filters together when both are given.  Id lists longer than
+        ``CLEARED_ORDERS_BATCH_SIZE`` are split into batches fetched
+        concurrently.  Returns an empty list on error.
         """
-        if not self._ensure_connected() or not bet_ids:
+        if not self._ensure_connected() or not (bet_ids or market_ids):
             return []
+        if bet_ids:
+            batches = [
+                (bet_ids[i:i + CLEARED_ORDERS_BATCH_SIZE], market_ids)
+                for i in range(0, len(bet_ids), CLEARED_ORDERS_BATCH_SIZE)
+            ]
+        else:
+            batches = [
+                (None, market_ids[i:i + CLEARED_ORDERS_BATCH_SIZE])
+                for i in range(0, len(market_ids), CLEARED_ORDERS_BATCH_SIZE)
+            ]
         try:
-            cleared = self._client.betting.list_cleared_orders(
-                bet_status="SETTLED",
-                bet_ids=bet_ids,
-            )
-            settled: List[SettledBet] = []
-            for order in (cleared.orders or []):
-                profit = float(order.profit)
-                result = "WON" if profit > 0 else ("VOID" if profit == 0 else "LOST")
-                settled.append(SettledBet(
-                    bet_id=order.bet_id,
-                    market_id=order.market_id,
-                    selection_id=order.selection_id,
-                    profit_loss=profit,
-                    result=result,
+            if len(batches) == 1:
+                order_batches = [self._list_cleared_orders(*batches[0])]
+            else:
+                order_batches = list(self._request_pool.map(
+                    lambda batch: self._list_cleared_orders(*batch), batches,
                 ))
+            settled: List[SettledBet] = []
+            for orders in order_batches:
+                for order in orders:
+                    profit = float(order.profit)
+                    result = "WON" if profit > 0 else ("VOID" if profit == 0 else "LOST")
+                    settled.append(SettledBet(
+                        bet_id=order.bet_id,
+                        market_id=order.market_id,
+                        selection_id=order.selection_id,
+                        profit_loss=profit,
+                        result=result,
+                    ))
             return settled
         except Exception as exc:
             logger.error("Failed to fetch settled bets: %s", exc)
             return []
+
+    def _list_cleared_orders(
+        self,
+        bet_ids: Optional[List[str]],
+        market_ids: Optional[List[str]],
+    ) -> list:
+        """Return every settled order matching one batch, following pages."""
+        orders: list = []
+        while True:
+            cleared = self._client.betting.list_cleared_orders(
+                bet_status="SETTLED",
+                bet_ids=bet_ids or None,
+                market_ids=market_ids or None,
+                from_record=len(orders),
+            )
+            orders.extend(cleared.orders or [])
+            if not cleared.more_available or not cleared.orders:
+                return orders
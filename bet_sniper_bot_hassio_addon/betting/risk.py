@@ -56,12 +56,13 @@ class RiskManager:
         if balance <= 0 or stake <= 0:
             return False
 
-        reserved = balance * (reserve_pct / 100.0)
-        max_daily = balance * (max_daily_loss_pct / 100.0)
-        deployable = balance - reserved - today_spend
+        max_daily = balance * max_daily_loss_pct * 0.01
+        deployable = balance * (1.0 - reserve_pct * 0.01) - today_spend
 
         daily_ok = (today_spend + stake) <= max_daily
         deploy_ok = stake <= deployable
+        if daily_ok and deploy_ok:
+            return True
 
         if not daily_ok:
             logger.info(
@@ -73,5 +74,4 @@ class RiskManager:
                 "Risk: deployable insufficient (deployable=%.2f < stake=%.2f)",
                 deployable, stake,
             )
-
-        return daily_ok and deploy_ok
+        return False
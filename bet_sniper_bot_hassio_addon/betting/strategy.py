@@ -27,7 +27,7 @@ from typing import List, Optional
 logger = logging.getLogger("bet_sniper.strategy")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Runner:
     """A single outcome in a MATCH_ODDS market."""
 
@@ -36,7 +36,7 @@ class Runner:
     best_back_price: float   # Best available back price (0.0 = no price)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Selection:
     """A chosen runner to back."""
 
@@ -65,25 +65,29 @@ class BetStrategy:
         max_odds:
             Inclusive upper bound for acceptable back odds.
         """
-        eligible = [
-            r for r in runners
-            if r.best_back_price > 0
-            and min_odds <= r.best_back_price <= max_odds
-        ]
-
-        if not eligible:
+        # Single pass: track the lowest (safest) qualifying price as we go.
+        chosen: Optional[Runner] = None
+        best_price = float("inf")
+        eligible = 0
+        for r in runners:
+            price = r.best_back_price
+            if price > 0 and min_odds <= price <= max_odds:
+                eligible += 1
+                if price < best_price:
+                    best_price = price
+                    chosen = r
+
+        if chosen is None:
             return None
 
-        # Pick the runner with the lowest (safest) odds within the range.
-        chosen = min(eligible, key=lambda r: r.best_back_price)
-
-        logger.debug(
-            "Selected: %s @ %.2f  (range %.2f–%.2f, %d eligible runners)",
-            chosen.name, chosen.best_back_price, min_odds, max_odds, len(eligible),
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Selected: %s @ %.2f  (range %.2f–%.2f, %d eligible runners)",
+                chosen.name, best_price, min_odds, max_odds, eligible,
+            )
 
         return Selection(
             runner_id=chosen.selection_id,
             name=chosen.name,
-            odds=chosen.best_back_price,
+            odds=best_price,
         )
@@ -15,7 +15,9 @@ import logging
 import os
 import signal
 import sys
+import threading
 from pathlib import Path
+from typing import List
 
 from betting.config import BetSniperConfig
 from betting.bot import BetSniperBot
@@ -39,6 +41,14 @@ logger = logging.getLogger("bet_sniper")
 # Argument parsing
 # ---------------------------------------------------------------------------
 
+def _bool(v: str) -> bool:
+    return v.lower() in ("true", "1", "yes")
+
+
+def _list(v: str) -> List[str]:
+    return [s.strip() for s in v.split(",") if s.strip()]
+
+
 def _parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Bet Sniper Bot – Betfair football betting")
 
@@ -48,19 +58,19 @@ def _parse_args() -> argparse.Namespace:
     p.add_argument("--username",            default=env("BETFAIR_USERNAME", ""))
     p.add_argument("--password",            default=env("BETFAIR_PASSWORD", ""))
     p.add_argument("--app-key",             default=env("BETFAIR_APP_KEY", ""))
-    p.add_argument("--paper-trading",       default=env("PAPER_TRADING", "true"))
-    p.add_argument("--virtual-balance",     default=env("VIRTUAL_BALANCE", "1000.0"))
-    p.add_argument("--leagues",             default=env("LEAGUES",
+    p.add_argument("--paper-trading",       type=_bool, default=env("PAPER_TRADING", "true"))
+    p.add_argument("--virtual-balance",     type=float, default=env("VIRTUAL_BALANCE", "1000.0"))
+    p.add_argument("--leagues",             type=_list, default=env("LEAGUES",
                    "soccer_italy_serie_a,soccer_epl,soccer_spain_la_liga,soccer_germany_bundesliga"))
-    p.add_argument("--min-odds",            default=env("MIN_ODDS", "1.5"))
-    p.add_argument("--max-odds",            default=env("MAX_ODDS", "3.5"))
-    p.add_argument("--stake-per-bet",       default=env("STAKE_PER_BET", "5.0"))
-    p.add_argument("--max-daily-loss-pct",  default=env("MAX_DAILY_LOSS_PCT", "10.0"))
-    p.add_argument("--reserve-pct",         default=env("RESERVE_PCT", "20.0"))
-    p.add_argument("--lookahead-hours",          default=env("LOOKAHEAD_HOURS", "24"))
-    p.add_argument("--check-interval",           default=env("CHECK_INTERVAL", "3600"))
-    p.add_argument("--bet-window-hours",         default=env("BET_WINDOW_HOURS", "2.0"))
-    p.add_argument("--min-time-to-ko-minutes",   default=env("MIN_TIME_TO_KO_MINUTES", "30"))
+    p.add_argument("--min-odds",            type=float, default=env("MIN_ODDS", "1.5"))
+    p.add_argument("--max-odds",            type=float, default=env("MAX_ODDS", "3.5"))
+    p.add_argument("--stake-per-bet",       type=float, default=env("STAKE_PER_BET", "5.0"))
+    p.add_argument("--max-daily-loss-pct",  type=float, default=env("MAX_DAILY_LOSS_PCT", "10.0"))
+    p.add_argument("--reserve-pct",         type=float, default=env("RESERVE_PCT", "20.0"))
+    p.add_argument("--lookahead-hours",          type=int, default=env("LOOKAHEAD_HOURS", "24"))
+    p.add_argument("--check-interval",           type=int, default=env("CHECK_INTERVAL", "3600"))
+    p.add_argument("--bet-window-hours",         type=float, default=env("BET_WINDOW_HOURS", "2.0"))
+    p.add_argument("--min-time-to-ko-minutes",   type=int, default=env("MIN_TIME_TO_KO_MINUTES", "30"))
     p.add_argument("--telegram-relay-url",       default=env("TELEGRAM_RELAY_URL", ""))
     p.add_argument("--telegram-api-key",         default=env("TELEGRAM_API_KEY", ""))
 
@@ -74,28 +84,22 @@ def _parse_args() -> argparse.Namespace:
 def main() -> None:
     args = _parse_args()
 
-    def _bool(v: str) -> bool:
-        return v.lower() in ("true", "1", "yes")
-
-    def _list(v: str):
-        return [s.strip() for s in v.split(",") if s.strip()]
-
     config = BetSniperConfig(
         username=args.username,
         password=args.password,
         app_key=args.app_key,
-        paper_trading=_bool(args.paper_trading),
-        virtual_balance=float(args.virtual_balance),
-        leagues=_list(args.leagues),
-        min_odds=float(args.min_odds),
-        max_odds=float(args.max_odds),
-        stake_per_bet=float(args.stake_per_bet),
-        max_daily_loss_pct=float(args.max_daily_loss_pct),
-        reserve_pct=float(args.reserve_pct),
-        lookahead_hours=int(args.lookahead_hours),
-        check_interval=int(args.check_interval),
-        bet_window_hours=float(args.bet_window_hours),
-        min_time_to_ko_minutes=int(args.min_time_to_ko_minutes),
+        paper_trading=args.paper_trading,
+        virtual_balance=args.virtual_balance,
+        leagues=args.leagues,
+        min_odds=args.min_odds,
+        max_odds=args.max_odds,
+        stake_per_bet=args.stake_per_bet,
+        max_daily_loss_pct=args.max_daily_loss_pct,
+        reserve_pct=args.reserve_pct,
+        lookahead_hours=args.lookahead_hours,
+        check_interval=args.check_interval,
+        bet_window_hours=args.bet_window_hours,
+        min_time_to_ko_minutes=args.min_time_to_ko_minutes,
         telegram_relay_url=args.telegram_relay_url,
         telegram_api_key=args.telegram_api_key,
     )
@@ -132,8 +136,13 @@ def main() -> None:
 
     def _handle_shutdown(sig, frame):
         logger.info("Signal %s received – shutting down …", sig)
-        bot.shutdown()
-        sys.exit(0)
+        # The bot finishes its current job before stopping; a second signal
+        # gets the default handler and exits immediately.
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        # shutdown() sets an Event whose lock the interrupted main thread may
+        # be holding, so it must not run inside the handler itself
+        threading.Thread(target=bot.shutdown, name="shutdown", daemon=True).start()
 
     signal.signal(signal.SIGINT, _handle_shutdown)
     signal.signal(signal.SIGTERM, _handle_shutdown)
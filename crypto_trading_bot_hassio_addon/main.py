@@ -12,9 +12,8 @@ import logging
 import os
 import signal
 import sys
-
-from trading.config import CryptoTradingConfig
-from trading.bot import CryptoBot
+import threading
+from typing import List
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -33,6 +32,17 @@ logger = logging.getLogger("crypto_bot")
 # Argument parsing
 # ---------------------------------------------------------------------------
 
+_TRUTHY = frozenset(("true", "1", "yes", "on", "y", "t"))
+
+
+def _bool(v: str) -> bool:
+    return v.strip().lower() in _TRUTHY
+
+
+def _list(v: str) -> List[str]:
+    return list(filter(None, map(str.strip, v.split(","))))
+
+
 def _parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Crypto Trading Bot – Binance Spot")
 
@@ -63,14 +73,16 @@ def _parse_args() -> argparse.Namespace:
 def main():
     args = _parse_args()
 
-    def _parse_list(raw: str):
-        return [s.strip() for s in raw.split(",") if s.strip()]
+    # Imported after argument parsing: trading.bot pulls in binance and
+    # pandas, which would otherwise slow down --help and argument errors.
+    from trading.config import CryptoTradingConfig
+    from trading.bot import CryptoBot
 
     config = CryptoTradingConfig(
         api_key=args.api_key,
         api_secret=args.api_secret,
-        paper_trading=args.paper_trading.lower() in ("true", "1", "yes"),
-        symbols=_parse_list(args.symbols),
+        paper_trading=_bool(args.paper_trading),
+        symbols=_list(args.symbols),
         timeframe=int(args.timeframe),
         max_position_value_usdt=float(args.max_position_value_usdt),
         stop_loss_pct=float(args.stop_loss_pct),
@@ -108,8 +120,13 @@ def main():
 
     def _handle_shutdown(sig, frame):
         logger.info(f"Signal {sig} received – shutting down …")
-        bot.shutdown()
-        sys.exit(0)
+        # The bot finishes its current tick before stopping; a second
+        # signal gets the default handler and exits immediately.
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        # stop() takes a lock the interrupted main thread may be holding,
+        # so it must not run inside the handler itself
+        threading.Thread(target=bot.stop, name="shutdown", daemon=True).start()
 
     signal.signal(signal.SIGINT, _handle_shutdown)
     signal.signal(signal.SIGTERM, _handle_shutdown)
@@ -120,6 +137,7 @@ def main():
         logger.critical(f"Fatal error: {exc}", exc_info=True)
         bot.shutdown()
         sys.exit(1)
+    bot.shutdown()
 
 
 if __name__ == "__main__":
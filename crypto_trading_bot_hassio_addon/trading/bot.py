@@ -3,21 +3,27 @@ CryptoBot – main orchestrator for Binance Spot intraday trading.
 
 Runs 24/7 (crypto never closes). Loop:
   1. Poll Telegram commands
-  2. For each symbol:
+  2. Fetch prices for all symbols in one request, then for each symbol:
      a. If position open → check if OCO fired (SL/TP hit server-side)
      b. If no position → evaluate momentum signal → enter if triggered
+        (bars for all candidate symbols are fetched concurrently)
   3. Daily reset at UTC midnight
-  4. Sleep check_interval seconds
+  4. Sleep check_interval seconds; Telegram commands that arrive meanwhile
+     (long-polled in the background) are handled as soon as they come in
 """
 
 from __future__ import annotations
 
-import json
 import logging
+import os
+import threading
 import time
-from datetime import datetime, timezone
+from decimal import Decimal
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, TextIO
+
+import orjson
+import pandas as pd
 
 from trading.config import CryptoTradingConfig
 from trading.position import Position, PositionSide, PositionStatus
@@ -38,6 +44,18 @@ TRADES_DB_FILE = STORAGE_DIR / "crypto_trades.db"
 
 _IP_WARNING_COOLDOWN = 3600  # seconds between repeated IP whitelist alerts
 
+# Close-reason labels for exit notifications and /stats
+_EXIT_REASON_LABELS = {
+    "stop_loss": "Stop-loss hit 🔴",
+    "take_profit": "Take-profit hit 🟢",
+    "manual": "Manual close",
+}
+_STATS_REASON_LABELS = {
+    "stop_loss": "Stop-loss",
+    "take_profit": "Take-profit",
+    "manual": "Manual",
+}
+
 
 def _fetch_public_ip() -> str:
     """Return the current public IPv4 address, or 'unknown' on failure."""
@@ -49,19 +67,34 @@ def _fetch_public_ip() -> str:
         return "unknown"
 
 
+def _json_default(obj: object) -> object:
+    """orjson fallback for positions: Decimal as a number, anything else as str.
+
+    NumPy scalars, enums and datetimes are serialized natively by orjson.
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return str(obj)
+
+
 class CryptoBot:
     def __init__(self, config: CryptoTradingConfig):
         self._config = config
         self._broker: BinanceBroker = create_broker(config)
         self._strategy = MomentumStrategy()
         self._risk = RiskManager(config)
-        self._running = False
+        # Set by stop(); ends the main loop and interrupts its sleep
+        self._stopping = threading.Event()
+        # Set by stop() and the Telegram listener to cut the sleep short
+        self._wakeup = threading.Event()
 
         # Active positions: symbol → Position
         self._positions: Dict[str, Position] = {}
+        # Subset of _positions that are still OPEN (kept in sync on open/close)
+        self._open_positions: Dict[str, Position] = {}
 
-        # Cooldown tracking: symbol → UTC datetime when position was closed
-        self._cooldowns: Dict[str, datetime] = {}
+        # Cooldown tracking: symbol → time.monotonic() at which re-entry is allowed
+        self._cooldowns: Dict[str, float] = {}
 
         # Telegram relay
         self._telegram = TelegramNotifier(
@@ -72,6 +105,16 @@ class CryptoBot:
         # Manual halt flag (set by /halt command)
         self._manual_halt: bool = False
 
+        # Telegram command → handler(chat_id, args)
+        self._cmd_handlers: Dict[str, Callable[[int, str], None]] = {
+            "status": self._cmd_status,
+            "positions": self._cmd_status,
+            "halt": self._cmd_halt,
+            "resume": self._cmd_resume,
+            "close": self._cmd_close,
+            "stats": self._cmd_stats,
+        }
+
         # Throttle IP warning notifications (avoid Telegram spam)
         self._last_ip_warning_ts: float = 0.0
 
@@ -80,6 +123,13 @@ class CryptoBot:
 
         STORAGE_DIR.mkdir(parents=True, exist_ok=True)
 
+        # Trade log kept open for the bot's lifetime (line-buffered append)
+        self._trade_log: Optional[TextIO] = None
+        try:
+            self._trade_log = open(TRADES_LOG_FILE, "a", buffering=1, encoding="utf-8")
+        except OSError as exc:
+            logger.warning(f"Could not open trade log: {exc}")
+
         # SQLite trade history (non-critical: DB errors never abort trading)
         self._trade_db = TradeDatabase(TRADES_DB_FILE)
 
@@ -110,8 +160,8 @@ class CryptoBot:
                 logger.warning(f"Could not load symbol info for {symbol}: {exc}")
 
         self._load_positions()
-        self._running = True
         self._telegram.start_keepalive()
+        self._telegram.start_command_listener(on_command=self._wakeup.set)
 
         logger.info(
             f"Crypto bot started. Symbols: {self._config.symbols} | "
@@ -125,21 +175,44 @@ class CryptoBot:
             f"Mode: {'📝 Paper' if self._config.paper_trading else '💰 Live'}"
         )
 
-        while self._running:
+        next_tick = time.monotonic()
+        while not self._stopping.is_set():
+            # Cleared before handling so a command arriving meanwhile re-wakes us
+            self._wakeup.clear()
             try:
-                self._tick()
+                now = time.monotonic()
+                if now >= next_tick:
+                    next_tick = now + self._config.check_interval
+                    self._tick()
+                else:
+                    self._process_telegram_commands()
             except Exception as exc:
                 logger.error(f"Unhandled error in main loop: {exc}", exc_info=True)
-            time.sleep(self._config.check_interval)
+            self._wakeup.wait(max(0.0, next_tick - time.monotonic()))
+
+    def stop(self):
+        """
+        Ask run() to return once the current tick has finished.
+        Thread-safe, but not async-signal-safe: Event.set() takes the lock
+        run() holds while clearing/waiting on _wakeup, so a signal handler on
+        the main thread must hand this call off to another thread.
+        """
+        self._stopping.set()
+        self._wakeup.set()
 
     def shutdown(self):
         logger.info("Shutdown requested …")
-        self._running = False
+        self.stop()
         self._save_positions()
         try:
             self._broker.disconnect()
         except Exception:
             pass
+        self._telegram.flush()
+        self._trade_db.close()
+        if self._trade_log is not None:
+            self._trade_log.close()
+            self._trade_log = None
         logger.info("Shutdown complete.")
 
     # ------------------------------------------------------------------
@@ -147,10 +220,10 @@ class CryptoBot:
     # ------------------------------------------------------------------
 
     def _tick(self):
-        now_utc = datetime.now(timezone.utc)
+        now = time.time()
 
         # Daily reset at UTC midnight
-        today = now_utc.date().toordinal()
+        today = int(now // 86400)  # days since the epoch, rolls over at UTC midnight
         if self._current_day is None:
             self._current_day = today
             self._daily_init()
@@ -161,10 +234,30 @@ class CryptoBot:
         # Process Telegram commands
         self._process_telegram_commands()
 
-        # Process each symbol
+        # Halted (manually or by the daily loss limit) with nothing open to
+        # monitor: no symbol can act this tick, so skip the broker round-trips
+        if self._manual_halt and not self._open_positions:
+            return
+
+        # One ticker request prices every symbol for this tick, and the
+        # OCO status of every open position is checked concurrently
+        prices = self._broker.get_quotes(self._config.symbols)
+        oco_results = self._broker.get_oco_results({
+            symbol: pos.oco_order_list_id
+            for symbol, pos in self._open_positions.items()
+            if pos.oco_order_list_id
+        })
+
+        # Process each symbol, collecting the flat ones that may enter.
+        # One clock reading serves every symbol's cooldown check.
+        mono_now = time.monotonic()
+        candidates = []
         for symbol in self._config.symbols:
             try:
-                self._process_symbol(symbol, now_utc)
+                if self._process_symbol(
+                    symbol, mono_now, prices.get(symbol), oco_results.get(symbol)
+                ):
+                    candidates.append(symbol)
             except BinanceAPIException as exc:
                 logger.error(f"Binance API error processing {symbol}: {exc}", exc_info=True)
                 if exc.code == -2015:
@@ -172,6 +265,14 @@ class CryptoBot:
             except Exception as exc:
                 logger.error(f"Error processing {symbol}: {exc}", exc_info=True)
 
+        if candidates and not self._daily_loss_limit_reached():
+            bars = self._broker.get_bars_batch(
+                candidates, self._config.timeframe, limit=50
+            )
+            for symbol in candidates:
+                if symbol in bars:
+                    self._check_and_enter(symbol, bars[symbol], prices.get(symbol))
+
     def _daily_init(self):
         try:
             value = self._broker.get_account_value()
@@ -188,43 +289,68 @@ class CryptoBot:
     # Symbol processing
     # ------------------------------------------------------------------
 
-    def _process_symbol(self, symbol: str, now_utc: datetime):
-        pos = self._positions.get(symbol)
+    def _process_symbol(
+        self,
+        symbol: str,
+        now: float,
+        current_price: Optional[float],
+        oco_result: Optional[dict] = None,
+    ) -> bool:
+        """
+        Monitor an open position, or decide whether a flat symbol may enter.
+
+        `now` is a time.monotonic() reading, compared against cooldowns.
+        `oco_result` is the position's get_oco_result() outcome for this tick.
+        Returns True when the symbol has no position, trading is not halted
+        and its cooldown has expired — i.e. its signal should be checked.
+        """
+        pos = self._open_positions.get(symbol)
 
         # ── Open position: check if OCO triggered ─────────────────────
-        if pos and pos.status == PositionStatus.OPEN:
-            current_price = self._broker.get_quote(symbol)
+        if pos:
+            if current_price is None:
+                current_price = self._broker.get_quote(symbol)
             if current_price:
                 pos.current_price = current_price
+            price = pos.current_price
 
             # Check if OCO was triggered server-side (SL or TP hit)
-            if pos.oco_order_list_id:
-                oco_result = self._broker.get_oco_result(symbol, pos.oco_order_list_id)
-                if oco_result is not None:
-                    # OCO fired — use actual fill price and reason from the Binance order
-                    fill_price = oco_result["fill_price"] or current_price or pos.current_price
-                    self._record_closed_position(pos, fill_price, oco_result["reason"])
-                    return
-
-            # Fallback local SL/TP check (e.g. if OCO status unavailable)
-            if pos.is_stop_loss_hit():
-                logger.info(f"{symbol}: local SL check hit at {pos.current_price:.6f}")
-                self._exit_position(symbol, pos.current_price, "stop_loss")
-            elif pos.is_take_profit_hit():
-                logger.info(f"{symbol}: local TP check hit at {pos.current_price:.6f}")
-                self._exit_position(symbol, pos.current_price, "take_profit")
-            else:
+            if oco_result is not None:
+                # OCO fired — use actual fill price and reason from the Binance order
+                fill_price = oco_result["fill_price"] or price
+                self._record_closed_position(pos, fill_price, oco_result["reason"])
+                return False
+
+            # Fallback local SL/TP check (e.g. if OCO status unavailable);
+            # a zero price means no quote has been seen yet
+            if price and price <= pos.stop_loss:
+                logger.info(f"{symbol}: local SL check hit at {price:.6f}")
+                self._exit_position(symbol, price, "stop_loss")
+            elif price and price >= pos.take_profit:
+                logger.info(f"{symbol}: local TP check hit at {price:.6f}")
+                self._exit_position(symbol, price, "take_profit")
+            elif logger.isEnabledFor(logging.DEBUG):
                 logger.debug(
-                    f"{symbol} LONG @ {pos.current_price:.6f} "
+                    f"{symbol} LONG @ {price:.6f} "
                     f"P&L={pos.unrealized_pnl:+.4f} USDT ({pos.unrealized_pnl_pct:+.2f}%)"
                 )
-            return
+            return False
 
-        # ── No position: check cooldown then evaluate signal ──────────
+        # ── No position: check cooldown before evaluating the signal ──
         if self._manual_halt:
-            return
+            return False
+
+        # Cooldown check
+        cooldown_until = self._cooldowns.get(symbol)
+        if cooldown_until is not None and now < cooldown_until:
+            remaining = int((cooldown_until - now) / 60)
+            logger.debug(f"{symbol}: cooldown active ({remaining}m remaining)")
+            return False
+
+        return True
 
-        # Check daily loss limit
+    def _daily_loss_limit_reached(self) -> bool:
+        """Check equity once per tick; halts new entries when the limit is hit."""
         try:
             equity = self._broker.get_account_value()
             if self._risk.should_halt_trading(equity):
@@ -233,26 +359,15 @@ class CryptoBot:
                     "⛔ <b>Daily loss limit reached.</b> No new positions will be opened today."
                 )
                 self._manual_halt = True
-                return
+                return True
         except Exception:
             pass
+        return False
 
-        # Cooldown check
-        if symbol in self._cooldowns:
-            elapsed_minutes = (now_utc - self._cooldowns[symbol]).total_seconds() / 60
-            if elapsed_minutes < self._config.cooldown_minutes:
-                remaining = int(self._config.cooldown_minutes - elapsed_minutes)
-                logger.debug(f"{symbol}: cooldown active ({remaining}m remaining)")
-                return
-
-        # Check signal
-        self._check_and_enter(symbol)
-
-    def _check_and_enter(self, symbol: str):
+    def _check_and_enter(
+        self, symbol: str, bars: pd.DataFrame, price: Optional[float] = None
+    ):
         try:
-            bars = self._broker.get_bars(
-                symbol, self._config.timeframe, limit=50
-            )
             if bars.empty:
                 return
 
@@ -260,7 +375,7 @@ class CryptoBot:
             if signal != Signal.LONG:
                 return
 
-            self._enter_position(symbol)
+            self._enter_position(symbol, price)
 
         except Exception as exc:
             logger.error(f"Signal check error for {symbol}: {exc}", exc_info=True)
@@ -269,8 +384,10 @@ class CryptoBot:
     # Position entry
     # ------------------------------------------------------------------
 
-    def _enter_position(self, symbol: str):
-        price = self._broker.get_quote(symbol)
+    def _enter_position(self, symbol: str, price: Optional[float] = None):
+        # The tick's batch quote is only moments old; fetch one if it is missing
+        if not price:
+            price = self._broker.get_quote(symbol)
         if not price or price <= 0:
             logger.warning(f"{symbol}: cannot enter — no price available")
             return
@@ -328,6 +445,7 @@ class CryptoBot:
             current_price=fill_price,
         )
         self._positions[symbol] = position
+        self._open_positions[symbol] = position
         position.db_trade_id = self._trade_db.open_trade(
             symbol=symbol,
             side="long",
@@ -362,7 +480,8 @@ class CryptoBot:
     def _record_closed_position(self, pos: Position, price: float, reason: str):
         """Record a position that was closed server-side by the OCO order."""
         pos.close(price, reason)
-        self._cooldowns[pos.symbol] = datetime.now(timezone.utc)
+        self._open_positions.pop(pos.symbol, None)
+        self._cooldowns[pos.symbol] = time.monotonic() + self._config.cooldown_minutes * 60
         pnl = pos.realized_pnl or 0.0
         self._risk.record_realized_pnl(pnl)
         if pos.db_trade_id is not None:
@@ -381,8 +500,8 @@ class CryptoBot:
 
     def _exit_position(self, symbol: str, price: float, reason: str):
         """Manually close a position via market sell + cancel OCO."""
-        pos = self._positions.get(symbol)
-        if pos is None or pos.status != PositionStatus.OPEN:
+        pos = self._open_positions.get(symbol)
+        if pos is None:
             return
 
         success = self._broker.close_position(
@@ -397,12 +516,7 @@ class CryptoBot:
 
     def _notify_exit(self, pos: Position, price: float, reason: str, pnl: float):
         emoji = "🟢" if pnl >= 0 else "🔴"
-        reason_labels = {
-            "stop_loss": "Stop-loss hit 🔴",
-            "take_profit": "Take-profit hit 🟢",
-            "manual": "Manual close",
-        }
-        label = reason_labels.get(reason, reason)
+        label = _EXIT_REASON_LABELS.get(reason, reason)
         pnl_pct = (pnl / pos.cost_usdt * 100) if pos.cost_usdt else 0.0
         self._telegram.notify(
             f"{emoji} <b>Position closed</b> – <code>{pos.symbol}</code>\n"
@@ -451,25 +565,9 @@ class CryptoBot:
             logger.info(f"Telegram /{command} {args}")
 
             try:
-                if command in ("status", "positions"):
-                    self._cmd_status(chat_id)
-                elif command == "halt":
-                    self._manual_halt = True
-                    self._telegram.send_result(
-                        chat_id,
-                        "⛔ <b>Trading halted.</b> No new positions will be opened.\n"
-                        "Use /resume to re-enable.",
-                    )
-                elif command == "resume":
-                    self._manual_halt = False
-                    self._telegram.send_result(
-                        chat_id,
-                        "✅ <b>Trading resumed.</b>",
-                    )
-                elif command == "close":
-                    self._cmd_close(chat_id, args.upper())
-                elif command == "stats":
-                    self._cmd_stats(chat_id)
+                handler = self._cmd_handlers.get(command)
+                if handler is not None:
+                    handler(chat_id, args)
                 else:
                     self._telegram.send_result(
                         chat_id,
@@ -480,11 +578,8 @@ class CryptoBot:
                 logger.error(f"Error processing /{command}: {exc}")
                 self._telegram.send_result(chat_id, f"❌ Error: {exc}")
 
-    def _cmd_status(self, chat_id: int):
-        open_positions = [
-            pos for pos in self._positions.values()
-            if pos.status == PositionStatus.OPEN
-        ]
+    def _cmd_status(self, chat_id: int, args: str = ""):
+        open_positions = list(self._open_positions.values())
         halt_note = " ⛔ <i>Halted</i>" if self._manual_halt else ""
         if not open_positions:
             self._telegram.send_result(
@@ -506,7 +601,23 @@ class CryptoBot:
             )
         self._telegram.send_result(chat_id, "\n".join(lines))
 
-    def _cmd_close(self, chat_id: int, symbol: str):
+    def _cmd_halt(self, chat_id: int, args: str = ""):
+        self._manual_halt = True
+        self._telegram.send_result(
+            chat_id,
+            "⛔ <b>Trading halted.</b> No new positions will be opened.\n"
+            "Use /resume to re-enable.",
+        )
+
+    def _cmd_resume(self, chat_id: int, args: str = ""):
+        self._manual_halt = False
+        self._telegram.send_result(
+            chat_id,
+            "✅ <b>Trading resumed.</b>",
+        )
+
+    def _cmd_close(self, chat_id: int, args: str):
+        symbol = args.upper()
         if not symbol:
             self._telegram.send_result(
                 chat_id,
@@ -514,8 +625,8 @@ class CryptoBot:
             )
             return
 
-        pos = self._positions.get(symbol)
-        if pos is None or pos.status != PositionStatus.OPEN:
+        pos = self._open_positions.get(symbol)
+        if pos is None:
             self._telegram.send_result(
                 chat_id,
                 f"❌ No open position for <code>{symbol}</code>.",
@@ -529,7 +640,7 @@ class CryptoBot:
             f"✅ Closing <code>{symbol}</code> at market…",
         )
 
-    def _cmd_stats(self, chat_id: int):
+    def _cmd_stats(self, chat_id: int, args: str = ""):
         s = self._trade_db.get_stats()
         if not s:
             self._telegram.send_result(chat_id, "❌ Could not retrieve statistics.")
@@ -545,13 +656,8 @@ class CryptoBot:
 
         wins = s["wins"]
         losses = total - wins
-        reason_labels = {
-            "stop_loss": "Stop-loss",
-            "take_profit": "Take-profit",
-            "manual": "Manual",
-        }
         reason_lines = [
-            f"   • {reason_labels.get(r, r)}: {d['count']} trades ({d['pnl']:+.4f} USDT)"
+            f"   • {_STATS_REASON_LABELS.get(r, r)}: {d['count']} trades ({d['pnl']:+.4f} USDT)"
             for r, d in s["by_reason"].items()
         ]
 
@@ -585,32 +691,41 @@ class CryptoBot:
     def _save_positions(self):
         try:
             data = {sym: pos.to_dict() for sym, pos in self._positions.items()}
-            POSITIONS_FILE.write_text(json.dumps(data, indent=2, default=str))
+            # Write-then-rename so a crash mid-write never leaves a truncated file
+            tmp = POSITIONS_FILE.with_suffix(".tmp")
+            tmp.write_bytes(orjson.dumps(data, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY))
+            os.replace(tmp, POSITIONS_FILE)
         except Exception as exc:
             logger.warning(f"Could not save positions: {exc}")
 
     def _load_positions(self):
         try:
             if POSITIONS_FILE.exists():
-                data = json.loads(POSITIONS_FILE.read_text())
+                data = orjson.loads(POSITIONS_FILE.read_bytes())
                 self._positions = {
                     sym: Position.from_dict(pos_data)
                     for sym, pos_data in data.items()
                 }
-                open_count = sum(
-                    1 for p in self._positions.values()
-                    if p.status == PositionStatus.OPEN
-                )
+                self._open_positions = {
+                    sym: pos for sym, pos in self._positions.items()
+                    if pos.status == PositionStatus.OPEN
+                }
                 logger.info(
                     f"Loaded {len(self._positions)} positions from disk "
-                    f"({open_count} open)"
+                    f"({len(self._open_positions)} open)"
                 )
         except Exception as exc:
             logger.warning(f"Could not load positions: {exc}")
 
     def _log_trade(self, action: str, position: Position):
+        if self._trade_log is None:
+            return
         try:
-            now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+            t = time.gmtime()
+            now = (
+                f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} "
+                f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+            )
             if action == "ENTER":
                 line = (
                     f"{now} UTC | ENTER | {position.symbol:<12} | LONG  |"
@@ -627,7 +742,6 @@ class CryptoBot:
                     f" | exit={position.close_price:.8f}"
                     f" | P&L={pnl:+.6f} USDT | reason={reason}"
                 )
-            with open(TRADES_LOG_FILE, "a") as f:
-                f.write(line + "\n")
+            self._trade_log.write(line + "\n")
         except Exception as exc:
             logger.warning(f"Could not write trade log: {exc}")
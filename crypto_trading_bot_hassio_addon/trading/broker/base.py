@@ -41,6 +41,19 @@ class BrokerBase(ABC):
     def get_quote(self, symbol: str) -> Optional[float]:
         """Return the current market price for a symbol."""
 
+    @abstractmethod
+    def get_quotes(self, symbols: List[str]) -> Dict[str, float]:
+        """Return current market prices for several symbols in one request."""
+
+    @abstractmethod
+    def get_bars_batch(
+        self, symbols: List[str], timeframe_minutes: int, limit: int = 50
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Return OHLCV bars for several symbols (see get_bars), keyed by symbol.
+        Symbols whose request fails are left out.
+        """
+
     @abstractmethod
     def place_bracket_order(
         self,
@@ -71,3 +84,10 @@ class BrokerBase(ABC):
         Returns None if still EXECUTING (position open) or on error.
         Returns {"fill_price": float, "reason": "stop_loss"|"take_profit"} when fired.
         """
+
+    @abstractmethod
+    def get_oco_results(self, oco_ids: Dict[str, str]) -> Dict[str, Optional[dict]]:
+        """
+        get_oco_result() for several positions at once.
+        `oco_ids` maps symbol → OCO order list ID; the result is keyed by symbol.
+        """
@@ -11,9 +11,12 @@ Supports:
 
 from __future__ import annotations
 
+import json
 import logging
 import math
-from typing import Dict, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 from binance.client import Client
@@ -35,6 +38,12 @@ _INTERVAL_MAP = {
     240: Client.KLINE_INTERVAL_4HOUR,
 }
 
+# Worker threads used to query several symbols concurrently (klines, OCOs)
+REQUEST_WORKERS = 4
+
+# Symbol filters rarely change; re-read them from exchangeInfo once a day
+SYMBOL_INFO_TTL = 24 * 3600
+
 
 class BinanceBroker(BrokerBase):
     """
@@ -51,8 +60,12 @@ class BinanceBroker(BrokerBase):
         self._api_secret = api_secret
         self._testnet = testnet
         self._client: Optional[Client] = None
-        # Cache symbol filters to avoid repeated API calls
-        self._symbol_filters: Dict[str, dict] = {}
+        # Cache symbol filters to avoid repeated API calls:
+        # symbol → (parsed filters, monotonic expiry)
+        self._symbol_filters: Dict[str, Tuple[dict, float]] = {}
+        self._request_pool = ThreadPoolExecutor(
+            max_workers=REQUEST_WORKERS, thread_name_prefix="binance"
+        )
 
     # ------------------------------------------------------------------
     # Connection
@@ -85,6 +98,7 @@ class BinanceBroker(BrokerBase):
             return False
 
     def disconnect(self) -> None:
+        self._request_pool.shutdown(wait=False)
         self._client = None
         logger.info("Disconnected from Binance.")
 
@@ -99,6 +113,8 @@ class BinanceBroker(BrokerBase):
         """Total stable-coin value + crypto holdings converted to USDT."""
         account = self._client.get_account()
         total = 0.0
+        # All prices in one request, fetched only if a non-stable asset is held
+        prices: Optional[Dict[str, float]] = None
         for asset in account["balances"]:
             free = float(asset["free"])
             locked = float(asset["locked"])
@@ -108,14 +124,16 @@ class BinanceBroker(BrokerBase):
             if asset["asset"] in self._STABLECOINS:
                 total += amount
             else:
+                if prices is None:
+                    prices = {
+                        t["symbol"]: float(t["price"])
+                        for t in self._client.get_symbol_ticker()
+                    }
                 for quote in ("USDT", "USDC"):
-                    try:
-                        price = float(self._client.get_symbol_ticker(
-                            symbol=asset["asset"] + quote)["price"])
+                    price = prices.get(asset["asset"] + quote)
+                    if price:
                         total += amount * price
                         break
-                    except Exception:
-                        continue
         return total
 
     def get_buying_power(self) -> float:
@@ -132,11 +150,23 @@ class BinanceBroker(BrokerBase):
     # ------------------------------------------------------------------
 
     def get_symbol_info(self, symbol: str) -> dict:
-        """Return parsed filters (stepSize, tickSize, minQty, minNotional)."""
-        if symbol in self._symbol_filters:
-            return self._symbol_filters[symbol]
+        """
+        Return parsed filters (stepSize, tickSize, minQty, minNotional).
+
+        Filters are cached for SYMBOL_INFO_TTL seconds. If a refresh fails,
+        the previous filters keep being used.
+        """
+        cached = self._symbol_filters.get(symbol)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
 
-        info = self._client.get_symbol_info(symbol)
+        try:
+            info = self._client.get_symbol_info(symbol)
+        except Exception as exc:
+            if cached is None:
+                raise
+            logger.warning(f"Could not refresh symbol info for {symbol}: {exc}")
+            return cached[0]
         if info is None:
             raise ValueError(f"Symbol {symbol} not found on Binance")
 
@@ -147,7 +177,7 @@ class BinanceBroker(BrokerBase):
             "tick_size": float(filters["PRICE_FILTER"]["tickSize"]),
             "min_notional": float(filters.get("MIN_NOTIONAL", {}).get("minNotional", 10.0)),
         }
-        self._symbol_filters[symbol] = parsed
+        self._symbol_filters[symbol] = (parsed, time.monotonic() + SYMBOL_INFO_TTL)
         return parsed
 
     def _round_qty(self, qty: float, step_size: float) -> float:
@@ -181,6 +211,22 @@ class BinanceBroker(BrokerBase):
         df["open_time"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
         return df[["open_time", "open", "high", "low", "close", "volume"]]
 
+    def get_bars_batch(
+        self, symbols: List[str], timeframe_minutes: int, limit: int = 50
+    ) -> Dict[str, pd.DataFrame]:
+        """Fetch bars for several symbols concurrently (one request each)."""
+        futures = {
+            symbol: self._request_pool.submit(self.get_bars, symbol, timeframe_minutes, limit)
+            for symbol in symbols
+        }
+        bars: Dict[str, pd.DataFrame] = {}
+        for symbol, future in futures.items():
+            try:
+                bars[symbol] = future.result()
+            except Exception as exc:
+                logger.error(f"Could not get bars for {symbol}: {exc}")
+        return bars
+
     def get_quote(self, symbol: str) -> Optional[float]:
         try:
             ticker = self._client.get_symbol_ticker(symbol=symbol)
@@ -189,6 +235,22 @@ class BinanceBroker(BrokerBase):
             logger.warning(f"Could not get quote for {symbol}: {exc}")
             return None
 
+    def get_quotes(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Prices for all `symbols` from a single ticker/price request.
+        Returns an empty dict on failure (callers fall back to get_quote).
+        """
+        if not symbols:
+            return {}
+        try:
+            tickers = self._client.get_symbol_ticker(
+                symbols=json.dumps(list(symbols), separators=(",", ":"))
+            )
+            return {t["symbol"]: float(t["price"]) for t in tickers}
+        except Exception as exc:
+            logger.warning(f"Could not get quotes for {', '.join(symbols)}: {exc}")
+            return {}
+
     # ------------------------------------------------------------------
     # Order placement
     # ------------------------------------------------------------------
@@ -327,6 +389,14 @@ class BinanceBroker(BrokerBase):
             logger.debug(f"get_oco_result error for {symbol} OCO {oco_order_list_id}: {exc}")
             return None  # treat as still active on error
 
+    def get_oco_results(self, oco_ids: Dict[str, str]) -> Dict[str, Optional[dict]]:
+        """Check several OCOs concurrently (see get_oco_result)."""
+        futures = {
+            symbol: self._request_pool.submit(self.get_oco_result, symbol, oco_id)
+            for symbol, oco_id in oco_ids.items()
+        }
+        return {symbol: future.result() for symbol, future in futures.items()}
+
     def close_position(
         self, symbol: str, qty: float, oco_order_list_id: Optional[str]
     ) -> bool:
@@ -71,20 +71,6 @@ class Position:
             return None
         return (self.close_price - self.entry_price) * self.quantity
 
-    # ------------------------------------------------------------------
-    # Trigger checks (used for local monitoring fallback)
-    # ------------------------------------------------------------------
-
-    def is_stop_loss_hit(self) -> bool:
-        if self.current_price == 0:
-            return False
-        return self.current_price <= self.stop_loss
-
-    def is_take_profit_hit(self) -> bool:
-        if self.current_price == 0:
-            return False
-        return self.current_price >= self.take_profit
-
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
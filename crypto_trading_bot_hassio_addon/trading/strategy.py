@@ -16,6 +16,7 @@ from __future__ import annotations
 import logging
 from enum import Enum
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger("crypto_bot.strategy")
@@ -23,6 +24,16 @@ logger = logging.getLogger("crypto_bot.strategy")
 MIN_BARS = 25
 
 
+def _ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Exponential moving average, equivalent to pandas ewm(alpha=alpha, adjust=False)."""
+    out = np.empty_like(values)
+    acc = float(values[0])
+    for i, value in enumerate(values.tolist()):
+        acc += alpha * (value - acc)
+        out[i] = acc
+    return out
+
+
 class Signal(str, Enum):
     LONG = "long"
     NONE = "none"
@@ -42,39 +53,35 @@ class MomentumStrategy:
             )
             return Signal.NONE
 
-        df = bars.copy()
-        df["ema9"] = df["close"].ewm(span=9, adjust=False).mean()
-        df["ema21"] = df["close"].ewm(span=21, adjust=False).mean()
-
-        # RSI (Wilder's smoothing via ewm com=13)
-        delta = df["close"].diff()
-        gain = delta.clip(lower=0)
-        loss = -delta.clip(upper=0)
-        avg_gain = gain.ewm(com=13, adjust=False).mean()
-        avg_loss = loss.ewm(com=13, adjust=False).mean()
-        rs = avg_gain / avg_loss.replace(0, float("nan"))
-        df["rsi"] = 100 - (100 / (1 + rs))
+        # Indicators are computed over plain float arrays: on a ~50-bar window the
+        # recursions below are far cheaper than pandas ewm()/diff().
+        close = bars["close"].to_numpy(dtype=float)
+        ema9 = _ewm(close, 2 / (9 + 1))
+        ema21 = _ewm(close, 2 / (21 + 1))
 
-        last = df.iloc[-1]
-        prev = df.iloc[-2]
+        # RSI (Wilder's smoothing, alpha = 1/14)
+        delta = np.diff(close)
+        avg_gain = _ewm(np.clip(delta, 0, None), 1 / 14)[-1]
+        avg_loss = _ewm(np.clip(-delta, 0, None), 1 / 14)[-1]
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss) if avg_loss else float("nan")
 
         # Bullish EMA crossover + RSI in healthy range
         if (
-            prev["ema9"] <= prev["ema21"]
-            and last["ema9"] > last["ema21"]
-            and 40 < last["rsi"] < 70
+            ema9[-2] <= ema21[-2]
+            and ema9[-1] > ema21[-1]
+            and 40 < rsi < 70
         ):
             logger.info(
-                f"{symbol} LONG signal: EMA9 ({last['ema9']:.4f}) crossed above "
-                f"EMA21 ({last['ema21']:.4f}), RSI={last['rsi']:.1f}"
+                f"{symbol} LONG signal: EMA9 ({ema9[-1]:.4f}) crossed above "
+                f"EMA21 ({ema21[-1]:.4f}), RSI={rsi:.1f}"
             )
             return Signal.LONG
 
-        spread = (last["ema9"] - last["ema21"]) / last["ema21"] * 100
+        spread = (ema9[-1] - ema21[-1]) / ema21[-1] * 100
         logger.info(
             f"{symbol}: no signal | "
-            f"EMA9={last['ema9']:.4f} EMA21={last['ema21']:.4f} spread={spread:+.3f}% | "
-            f"RSI={last['rsi']:.1f} | "
-            f"price={last['close']:.4f}"
+            f"EMA9={ema9[-1]:.4f} EMA21={ema21[-1]:.4f} spread={spread:+.3f}% | "
+            f"RSI={rsi:.1f} | "
+            f"price={close[-1]:.4f}"
         )
         return Signal.NONE
@@ -5,20 +5,35 @@ The HA trading bot (Raspberry Pi) cannot be reached from the internet, so all
 Telegram communication is routed through the Render relay service:
 
   HA bot ──POST /api/notify──────────► relay ──► Telegram users (broadcast)
-  HA bot ──GET  /api/commands─────────► relay     (clears & returns queue)
+  HA bot ──GET  /api/commands─────────► relay     (clears & returns queue;
+                                                   long-polls with ?timeout=)
   HA bot ──POST /api/command-result──► relay ──► specific user chat
+
+Broadcast notifications are sent from a background thread so that trading
+code never waits on the relay; command results are sent synchronously.
 """
 
 import json
 import logging
+import queue
 import threading
 import time
 import urllib.error
 import urllib.request
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Union
 
 logger = logging.getLogger("crypto_bot.telegram")
 
+# Max notifications waiting to be sent; newer ones are dropped when full
+NOTIFY_QUEUE_SIZE = 256
+# Seconds the relay may hold a GET /api/commands long-poll open.
+COMMAND_POLL_TIMEOUT = 25
+# Minimum spacing between polls when a call returns early without commands
+# (an older relay that ignores ?timeout=), and the first relay-error retry delay.
+MIN_POLL_INTERVAL = 5
+# Ceiling for the exponential back-off while the relay is unreachable.
+MAX_POLL_BACKOFF = 300
+
 
 class TelegramNotifier:
     """Sends notifications and polls commands from the Render relay service."""
@@ -27,16 +42,46 @@ class TelegramNotifier:
         self._relay_url = relay_url.rstrip("/")
         self._api_key = api_key
         self._timeout = timeout
+        # Pending broadcasts (str) and flush markers (Event) for the sender
+        self._outbox: "queue.Queue[Union[str, threading.Event]]" = queue.Queue(
+            maxsize=NOTIFY_QUEUE_SIZE
+        )
+        self._sender: Optional[threading.Thread] = None
+        # Filled by the long-poll listener thread, drained by poll_commands().
+        self._commands: "queue.Queue[Dict]" = queue.Queue()
+        self._listening = False
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
     def notify(self, html: str) -> None:
-        """Broadcast an HTML-formatted message to all Telegram users."""
+        """
+        Queue an HTML-formatted message for broadcast to all Telegram users.
+        Returns immediately; the message is posted by a background thread.
+        """
         if not self._relay_url or not html:
             return
-        self._post("/api/notify", {"text": html})
+        if self._sender is None:
+            self._sender = threading.Thread(
+                target=self._send_loop, daemon=True, name="telegram-notify"
+            )
+            self._sender.start()
+        try:
+            self._outbox.put_nowait(html)
+        except queue.Full:
+            logger.warning("Telegram notification queue full – message dropped")
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait up to `timeout` seconds for queued notifications to be sent."""
+        if self._sender is None:
+            return
+        done = threading.Event()
+        try:
+            self._outbox.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
 
     def poll_commands(self) -> List[Dict]:
         """
@@ -44,9 +89,19 @@ class TelegramNotifier:
         Returns a list of command dicts:
           { "id": str, "command": str, "args": str,
             "chat_id": int, "timestamp": str }
+
+        Once start_command_listener() is running this never blocks: it just
+        drains the commands the listener has already received.
         """
         if not self._relay_url:
             return []
+        if self._listening:
+            commands: List[Dict] = []
+            while True:
+                try:
+                    commands.append(self._commands.get_nowait())
+                except queue.Empty:
+                    return commands
         result = self._get("/api/commands")
         if result and isinstance(result.get("commands"), list):
             return result["commands"]
@@ -58,6 +113,51 @@ class TelegramNotifier:
             return
         self._post("/api/command-result", {"chat_id": chat_id, "text": html})
 
+    def start_command_listener(
+        self, on_command: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Start a background daemon thread that long-polls GET /api/commands
+        and queues every command it receives for poll_commands().
+        `on_command` is called after each batch so the caller can wake up
+        immediately instead of waiting for its next scheduled poll.
+        """
+        if not self._relay_url:
+            return
+
+        def _loop():
+            path = f"/api/commands?timeout={COMMAND_POLL_TIMEOUT}"
+            failures = 0
+            while True:
+                started = time.monotonic()
+                try:
+                    result = self._fetch_json(path, timeout=COMMAND_POLL_TIMEOUT + self._timeout)
+                except Exception as exc:
+                    # Log only the start and end of an outage, backing off meanwhile
+                    if not failures:
+                        logger.warning(f"Telegram relay GET {path} failed: {exc} – backing off")
+                    failures += 1
+                    time.sleep(min(MIN_POLL_INTERVAL * 2 ** (failures - 1), MAX_POLL_BACKOFF))
+                    continue
+                if failures:
+                    logger.info(f"Telegram relay reachable again after {failures} failed polls")
+                    failures = 0
+                commands = result.get("commands") if result else None
+                if isinstance(commands, list) and commands:
+                    for cmd in commands:
+                        self._commands.put(cmd)
+                    if on_command is not None:
+                        on_command()
+                    continue
+                elapsed = time.monotonic() - started
+                if elapsed < MIN_POLL_INTERVAL:
+                    time.sleep(MIN_POLL_INTERVAL - elapsed)
+
+        self._listening = True
+        t = threading.Thread(target=_loop, daemon=True, name="telegram-commands")
+        t.start()
+        logger.info(f"Telegram command listener started (long-poll {COMMAND_POLL_TIMEOUT}s)")
+
     def start_keepalive(self, interval: int = 600) -> None:
         """
         Start a background daemon thread that pings GET /health every `interval`
@@ -89,6 +189,14 @@ class TelegramNotifier:
         t.start()
         logger.info(f"Telegram relay keepalive started (interval={interval}s)")
 
+    def _send_loop(self) -> None:
+        while True:
+            item = self._outbox.get()
+            if isinstance(item, threading.Event):
+                item.set()
+            else:
+                self._post("/api/notify", {"text": item})
+
     # ------------------------------------------------------------------
     # Internal HTTP helpers (stdlib only – no extra dependencies)
     # ------------------------------------------------------------------
@@ -112,16 +220,19 @@ class TelegramNotifier:
             logger.warning(f"Telegram relay POST {path} failed: {exc}")
             return None
 
-    def _get(self, path: str) -> Optional[dict]:
+    def _fetch_json(self, path: str, timeout: Optional[int] = None) -> dict:
         url = f"{self._relay_url}{path}"
         req = urllib.request.Request(
             url,
             headers={"X-API-Key": self._api_key},
             method="GET",
         )
+        with urllib.request.urlopen(req, timeout=timeout or self._timeout) as resp:
+            return json.loads(resp.read())
+
+    def _get(self, path: str, timeout: Optional[int] = None) -> Optional[dict]:
         try:
-            with urllib.request.urlopen(req, timeout=self._timeout) as resp:
-                return json.loads(resp.read())
+            return self._fetch_json(path, timeout)
         except Exception as exc:
             logger.warning(f"Telegram relay GET {path} failed: {exc}")
             return None
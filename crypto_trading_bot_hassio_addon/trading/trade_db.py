@@ -4,6 +4,10 @@ Every trade is stored in ``/data/crypto_trades.db`` as a single row that is
 first inserted (open) and then updated (close).  The schema is created
 automatically on first run.
 
+Writes are queued and committed by a background thread, so the trading loop
+never waits on an fsync.  Trade ids are assigned up front (the bot is the
+only writer), which lets ``open_trade`` return the row id immediately.
+
 Lifecycle::
 
     db_id = trade_db.open_trade(...)      # called in _enter_position → returns row id
@@ -37,12 +41,13 @@ Statistics queries (examples)::
 from __future__ import annotations
 
 import logging
+import queue
 import sqlite3
 import threading
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Generator, Optional
+from typing import Dict, Generator, Optional, Tuple, Union
 
 logger = logging.getLogger("crypto_bot.trade_db")
 
@@ -80,6 +85,45 @@ _CREATE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_trades_close_reason ON trades(close_reason)",
 ]
 
+_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+]
+
+_INSERT_TRADE = """
+INSERT INTO trades (
+    id, symbol, side, broker, strategy,
+    entry_time, entry_price, quantity, cost,
+    stop_loss, take_profit, order_id, oco_order_list_id
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_CLOSE_TRADE = """
+UPDATE trades SET
+    close_price      = ?,
+    close_time       = ?,
+    close_reason     = ?,
+    duration_seconds = ?,
+    realized_pnl     = ?,
+    realized_pnl_pct = ?,
+    win              = ?,
+    updated_at       = datetime('now')
+WHERE id = ?
+"""
+
+# Highest id ever handed out (AUTOINCREMENT never reuses deleted ids)
+_LAST_ID = """
+SELECT MAX(
+    COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'trades'), 0),
+    COALESCE((SELECT MAX(id) FROM trades), 0)
+)
+"""
+
+# Seconds shutdown waits for queued writes to be committed
+_CLOSE_TIMEOUT = 5.0
+# Seconds get_stats waits for queued writes before querying anyway
+_STATS_FLUSH_TIMEOUT = 2.0
+
 
 class TradeDatabase:
     """Thread-safe SQLite persistence for crypto trade history."""
@@ -87,28 +131,84 @@ class TradeDatabase:
     def __init__(self, db_path: Path) -> None:
         self._db_path = str(db_path)
         self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_id = 0
+        # (description, sql, params, trade_id) waiting for the writer, flush
+        # markers (Event), or None to stop it
+        self._writes: "queue.Queue[Union[None, threading.Event, Tuple[str, str, tuple, int]]]" = (
+            queue.Queue()
+        )
+        self._writer: Optional[threading.Thread] = None
+        # Insert params of trades whose INSERT failed, re-tried on close (writer-only)
+        self._failed_opens: Dict[int, tuple] = {}
         self._init_db()
 
     @contextmanager
     def _connect(self) -> Generator[sqlite3.Connection, None, None]:
-        conn = sqlite3.connect(self._db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Yield the shared connection (callers must hold ``_lock``)."""
+        if self._conn is None:
+            raise sqlite3.OperationalError("trade database is not available")
+        yield self._conn
 
     def _init_db(self) -> None:
         try:
-            with self._lock, self._connect() as conn:
-                conn.execute(_CREATE_TABLE)
-                for stmt in _CREATE_INDEXES:
-                    conn.execute(stmt)
-                conn.commit()
+            conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            for pragma in _PRAGMAS:
+                conn.execute(pragma)
+            conn.execute(_CREATE_TABLE)
+            for stmt in _CREATE_INDEXES:
+                conn.execute(stmt)
+            conn.commit()
+            self._last_id = conn.execute(_LAST_ID).fetchone()[0]
+            self._conn = conn
+            self._writer = threading.Thread(
+                target=self._write_loop, daemon=True, name="trade-db-writer"
+            )
+            self._writer.start()
             logger.info("Trade database initialised at %s", self._db_path)
         except Exception as exc:
             logger.error("Failed to initialise trade database: %s", exc)
 
+    def _write_loop(self) -> None:
+        while True:
+            item = self._writes.get()
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            description, sql, params, trade_id = item
+            try:
+                with self._lock, self._connect() as conn:
+                    updated = conn.execute(sql, params).rowcount
+                    if not updated and trade_id in self._failed_opens:
+                        # The open was never stored: write the whole row now
+                        conn.execute(_INSERT_TRADE, self._failed_opens[trade_id])
+                        updated = conn.execute(sql, params).rowcount
+                    conn.commit()
+                self._failed_opens.pop(trade_id, None)
+                if not updated:
+                    logger.error("Failed to record %s: no trade row with that id", description)
+            except Exception as exc:
+                logger.error("Failed to record %s: %s", description, exc)
+                if sql is _INSERT_TRADE:
+                    self._failed_opens[trade_id] = params
+
+    def close(self) -> None:
+        """Commit queued writes (waiting up to ``_CLOSE_TIMEOUT`` s) and close."""
+        if self._writer is None:
+            return
+        self._writes.put(None)
+        self._writer.join(timeout=_CLOSE_TIMEOUT)
+        if self._writer.is_alive():
+            logger.warning("Trade database writer did not finish; pending writes lost")
+            return
+        self._writer = None
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+
     def open_trade(
         self,
         symbol: str,
@@ -123,38 +223,33 @@ class TradeDatabase:
         order_id: Optional[str] = None,
         oco_order_list_id: Optional[str] = None,
     ) -> Optional[int]:
-        """Insert a new open-trade record and return the auto-increment id.
+        """Queue a new open-trade record and return its id.
 
         ``cost`` is stored as ``entry_price * quantity`` (USDT).
-        Returns ``None`` if the insert fails; trading continues normally.
+        Returns ``None`` if the database is unavailable; trading continues
+        normally.  A failed insert is logged by the writer thread and
+        retried with the full row when the trade is closed.
         """
-        cost = entry_price * quantity
-        try:
-            with self._lock, self._connect() as conn:
-                cur = conn.execute(
-                    """
-                    INSERT INTO trades (
-                        symbol, side, broker, strategy,
-                        entry_time, entry_price, quantity, cost,
-                        stop_loss, take_profit, order_id, oco_order_list_id
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        symbol, side, broker, strategy,
-                        entry_time.isoformat(), entry_price, quantity, cost,
-                        stop_loss, take_profit, order_id, oco_order_list_id,
-                    ),
-                )
-                conn.commit()
-                trade_id = cur.lastrowid
-            logger.debug(
-                "Trade opened in DB: id=%d %s %s @ %.6f",
-                trade_id, symbol, side, entry_price,
-            )
-            return trade_id
-        except Exception as exc:
-            logger.error("Failed to record trade open for %s: %s", symbol, exc)
+        if self._writer is None:
             return None
+        cost = entry_price * quantity
+        self._last_id += 1
+        trade_id = self._last_id
+        self._writes.put((
+            f"trade open for {symbol}",
+            _INSERT_TRADE,
+            (
+                trade_id, symbol, side, broker, strategy,
+                entry_time.isoformat(), entry_price, quantity, cost,
+                stop_loss, take_profit, order_id, oco_order_list_id,
+            ),
+            trade_id,
+        ))
+        logger.debug(
+            "Trade opened in DB: id=%d %s %s @ %.6f",
+            trade_id, symbol, side, entry_price,
+        )
+        return trade_id
 
     def close_trade(
         self,
@@ -172,37 +267,25 @@ class TradeDatabase:
         ``cost`` is ``entry_price * quantity`` in USDT, used to compute
         the percentage gain/loss.
         """
+        if self._writer is None:
+            return
         realized_pnl_pct = (realized_pnl / cost * 100) if cost else 0.0
         duration_seconds = int((close_time - entry_time).total_seconds())
         win = 1 if realized_pnl > 0 else 0
-        try:
-            with self._lock, self._connect() as conn:
-                conn.execute(
-                    """
-                    UPDATE trades SET
-                        close_price      = ?,
-                        close_time       = ?,
-                        close_reason     = ?,
-                        duration_seconds = ?,
-                        realized_pnl     = ?,
-                        realized_pnl_pct = ?,
-                        win              = ?,
-                        updated_at       = datetime('now')
-                    WHERE id = ?
-                    """,
-                    (
-                        close_price, close_time.isoformat(), close_reason,
-                        duration_seconds, realized_pnl, realized_pnl_pct, win,
-                        trade_id,
-                    ),
-                )
-                conn.commit()
-            logger.debug(
-                "Trade closed in DB: id=%d reason=%s pnl=%.6f USDT (%.2f%%)",
-                trade_id, close_reason, realized_pnl, realized_pnl_pct,
-            )
-        except Exception as exc:
-            logger.error("Failed to record trade close for id=%d: %s", trade_id, exc)
+        self._writes.put((
+            f"trade close for id={trade_id}",
+            _CLOSE_TRADE,
+            (
+                close_price, close_time.isoformat(), close_reason,
+                duration_seconds, realized_pnl, realized_pnl_pct, win,
+                trade_id,
+            ),
+            trade_id,
+        ))
+        logger.debug(
+            "Trade closed in DB: id=%d reason=%s pnl=%.6f USDT (%.2f%%)",
+            trade_id, close_reason, realized_pnl, realized_pnl_pct,
+        )
 
     def get_stats(self) -> dict:
         """Return aggregated statistics from the crypto trade history.
@@ -210,8 +293,19 @@ class TradeDatabase:
         All P&L amounts are in USDT.
         Returns an empty dict on DB error (non-critical).
         """
+        # Include trades still waiting in the write queue, but never let a
+        # stalled writer block the caller: query whatever is committed
+        if self._writer is not None:
+            flushed = threading.Event()
+            self._writes.put(flushed)
+            if not flushed.wait(_STATS_FLUSH_TIMEOUT):
+                logger.warning("Trade database writer is behind; stats may be incomplete")
+        # The writer holds the lock while committing; give up rather than hang
+        if not self._lock.acquire(timeout=_STATS_FLUSH_TIMEOUT):
+            logger.error("Failed to query trade stats: database is busy")
+            return {}
         try:
-            with self._lock, self._connect() as conn:
+            with self._connect() as conn:
                 row = conn.execute("""
                     SELECT
                         COUNT(*)                                  AS total,
@@ -280,3 +374,5 @@ class TradeDatabase:
         except Exception as exc:
             logger.error("Failed to query trade stats: %s", exc)
             return {}
+        finally:
+            self._lock.release()
@@ -21,6 +21,7 @@ Environment variables (set in Render dashboard):
                         (leave empty to use long-polling instead)
 """
 
+import asyncio
 import os
 import uuid
 from collections import deque
@@ -63,6 +64,12 @@ TELEGRAM_API = f"https://api.telegram.org/bot{BOT_TOKEN}"
 # Commands waiting to be polled by the HA bot
 command_queue: deque[dict] = deque(maxlen=200)
 
+# Set whenever a command is queued; wakes long-polling GET /api/commands calls
+command_available = asyncio.Event()
+
+# Upper bound for the ?timeout= long-poll parameter (seconds)
+MAX_POLL_TIMEOUT = 50
+
 # All chat IDs that have interacted with the bot (used to broadcast notifications)
 known_chat_ids: set[int] = set(ALLOWED_CHAT_IDS)
 
@@ -172,6 +179,7 @@ async def telegram_webhook(request: Request):
             "chat_id":   chat_id,
             "timestamp": datetime.now(timezone.utc).isoformat(),
         })
+        command_available.set()
         await _send_message(
             chat_id,
             f"⏳ Command <code>{raw_cmd}</code> queued (id: <code>{command_id}</code>) …",
@@ -187,12 +195,22 @@ async def telegram_webhook(request: Request):
 # ---------------------------------------------------------------------------
 
 @app.get("/api/commands", dependencies=[Depends(_require_api_key)])
-async def get_commands():
+async def get_commands(timeout: float = 0):
     """
     Poll pending commands.
     Returns the full queue and clears it.
-    Called by the HA trading bot every check_interval seconds.
+
+    With ``?timeout=N`` (long polling) the request is held open for up to N
+    seconds (max MAX_POLL_TIMEOUT) until a command arrives; without it the
+    call returns immediately, as before.
     """
+    timeout = max(0.0, min(timeout, MAX_POLL_TIMEOUT))
+    if not command_queue and timeout:
+        command_available.clear()
+        try:
+            await asyncio.wait_for(command_available.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
     cmds = list(command_queue)
     command_queue.clear()
     return {"commands": cmds}